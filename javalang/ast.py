@@ -1,7 +1,5 @@
 import pickle
 
-import six
-
 
 class MetaNode(type):
     def __new__(mcs, name, bases, dict):
@@ -17,19 +15,23 @@ class MetaNode(type):
         return type.__new__(mcs, name, bases, dict)
 
 
-@six.add_metaclass(MetaNode)
-class Node(object):
+class Node(object, metaclass=MetaNode):
     attrs = ()
 
     def __init__(self, **kwargs):
-        values = kwargs.copy()
-
+        # kwargs is already a fresh dict, so it can be consumed in place
         for attr_name in self.attrs:
-            value = values.pop(attr_name, None)
+            value = kwargs.pop(attr_name, None)
             setattr(self, attr_name, value)
 
-        if values:
-            raise ValueError('Extraneous arguments')
+        if kwargs:
+            # The parser passes the source position along with the attributes
+            # rather than assigning it after construction
+            if '_position' in kwargs:
+                self._position = kwargs.pop('_position')
+
+            if kwargs:
+                raise ValueError('Extraneous arguments')
 
     def __equals__(self, other):
         if type(other) is not type(self):
@@ -1,4 +1,4 @@
-import six
+import os
 
 from . import util
 from . import tree
@@ -7,19 +7,95 @@ from .tokenizer import (
     Annotation, Literal, Operator, JavaToken,
     )
 
-ENABLE_DEBUG_SUPPORT = False
+# Tracing wrappers are only installed when JAVALANG_DEBUG is set at import
+# time; Parser.set_debug() then switches the trace output on
+ENABLE_DEBUG_SUPPORT = bool(os.environ.get('JAVALANG_DEBUG'))
+
+_EMPTY_DIMENSIONS = ()
+
+def _extend_dimensions(dimensions, more):
+    """ Returns dimensions followed by more. The shared empty value cannot
+    be extended in place, so a new list is built when there is anything to
+    add.
+
+    """
+
+    if not more:
+        return dimensions
+
+    return list(dimensions) + list(more)
+
+# Most declarations carry no modifiers or annotations, so those share these
+# instead of allocating a fresh set and list each time
+_EMPTY_MODIFIERS = frozenset()
+_FINAL_MODIFIERS = frozenset(('final',))
+_EMPTY_ANNOTATIONS = ()
+
+# A source file repeats a handful of modifier combinations ('public',
+# 'private static final', ...), so parse_modifiers hands out one shared
+# frozenset per combination
+_MODIFIER_SETS = {_FINAL_MODIFIERS: _FINAL_MODIFIERS}
+
+# Shared by every empty parameter or argument list, e.g. 'm()' or 'f()'
+_EMPTY_PARAMETERS = ()
+_EMPTY_ARGUMENTS = ()
+
+# Shared by every operand without prefix or postfix operators or selectors
+_EMPTY_OPERATORS = ()
+_EMPTY_SELECTORS = ()
+
+_SWITCH_LABELS = frozenset(('case', 'default'))
+_SWITCH_GROUP_END = frozenset(('case', 'default', '}'))
+_SELECTOR_STARTS = frozenset(('.', '['))
+_WILDCARD_BOUNDS = frozenset(('extends', 'super'))
+_TYPE_DECLARATION_KEYWORDS = frozenset(('class', 'interface', 'enum', 'record'))
+_LOCAL_TYPE_DECLARATION_STARTS = frozenset(('class', 'enum', 'interface', '@'))
+
+# Kind codes for the token classes that lookahead scans test most often
+_OTHER_KIND = 0
+_IDENTIFIER_KIND = 1
+_BASIC_TYPE_KIND = 2
+_MODIFIER_KIND = 3
+_ANNOTATION_KIND = 4
+_LITERAL_KIND = 5
+
+_TOKEN_KINDS = {
+    Identifier: _IDENTIFIER_KIND,
+    BasicType: _BASIC_TYPE_KIND,
+    Modifier: _MODIFIER_KIND,
+    Annotation: _ANNOTATION_KIND,
+}
+
+# Kinds are looked up by exact token class, so every literal class is listed
+_literal_types = [Literal]
+for _literal_type in _literal_types:
+    _TOKEN_KINDS[_literal_type] = _LITERAL_KIND
+    _literal_types.extend(_literal_type.__subclasses__())
+del _literal_types, _literal_type
+
+_TYPE_ARGUMENT_KINDS = frozenset((_IDENTIFIER_KIND, _BASIC_TYPE_KIND, _ANNOTATION_KIND))
+_TYPE_ARGUMENT_TOKENS = frozenset(('.', ',', '?', '&', '[', ']', 'extends', 'super'))
+_TYPE_ARGUMENT_CLOSERS = frozenset(('>', '>>', '>>>'))
+_DECLARATOR_FOLLOWERS = frozenset(('=', ';', ',', '['))
+_FOR_DECLARATOR_FOLLOWERS = _DECLARATOR_FOLLOWERS | frozenset((':',))
+_QUALIFIED_TAIL = frozenset(('.', '(', '['))
+_PATTERN_NODES = (tree.FormalParameter, tree.RecordPattern)
+_INFIX_OR_INSTANCEOF = Operator.INFIX | frozenset(('instanceof',))
+_CAST_OPERAND_STARTS = (frozenset(('(', 'new', 'this', 'super', 'void', 'switch'))
+                        | Operator.PREFIX)
 
 def parse_debug(method):
-    global ENABLE_DEBUG_SUPPORT
-
+    # With debug support off the production is returned untouched, so the
+    # decorator costs nothing per call. Productions taking arguments are
+    # forwarded them when tracing is on.
     if ENABLE_DEBUG_SUPPORT:
-        def _method(self):
+        def _method(self, *args, **kwargs):
             if not hasattr(self, 'recursion_depth'):
                 self.recursion_depth = 0
 
             if self.debug:
                 depth = "%02d" % (self.recursion_depth,)
-                token = six.text_type(self.tokens.look())
+                token = str(self.tokens.look())
                 start_value = self.tokens.look().value
                 name = method.__name__
                 sep = ("-" * self.recursion_depth)
@@ -30,25 +106,25 @@ def parse_debug(method):
                 self.recursion_depth += 1
 
                 try:
-                    r = method(self)
+                    r = method(self, *args, **kwargs)
 
                 except JavaSyntaxError as e:
                     e_message = e.description
                     raise
 
                 except Exception as e:
-                    e_message = six.text_type(e)
+                    e_message = str(e)
                     raise
 
                 finally:
-                    token = six.text_type(self.tokens.last())
+                    token = str(self.tokens.last())
                     print("%s <%s %s(%s, %s) %s" %
                         (depth, sep, name, start_value, token, e_message))
                     self.recursion_depth -= 1
             else:
                 self.recursion_depth += 1
                 try:
-                    r = method(self)
+                    r = method(self, *args, **kwargs)
                 finally:
                     self.recursion_depth -= 1
 
@@ -67,12 +143,26 @@ class JavaParserBaseException(Exception):
         super(JavaParserBaseException, self).__init__(message)
 
 class JavaSyntaxError(JavaParserBaseException):
+    # Most syntax errors are raised while probing and swallowed again, so the
+    # description may be given as a (format, args) pair and is only rendered
+    # when somebody actually reads it.
     def __init__(self, description, at=None):
         super(JavaSyntaxError, self).__init__()
 
-        self.description = description
+        self._description = description
         self.at = at
 
+    @property
+    def description(self):
+        description = self._description
+        if type(description) is tuple:
+            description = description[0] % description[1]
+            self._description = description
+        return description
+
+    def __str__(self):
+        return self.description
+
 class JavaParserError(JavaParserBaseException):
     pass
 
@@ -91,13 +181,28 @@ class Parser(object):
                             set(('+', '-')),
                             set(('*', '/', '%')) ]
 
+    # Binding strength of each binary operator, its index in the list above
+    operator_levels = dict((operator, level)
+                           for level, operators in enumerate(operator_precedence)
+                           for operator in operators)
+
     def __init__(self, tokens):
         self.tokens = util.LookAheadListIterator(tokens)
         self.tokens.set_default(EndOfInput(None))
 
+        # Token values laid out flat alongside the token list, so probing
+        # for a keyword or separator is a single list index
+        self.token_values = [token.value for token in self.tokens.list]
+        self.token_kinds = [_TOKEN_KINDS.get(type(token), _OTHER_KIND)
+                            for token in self.tokens.list]
+
         self.debug = False
         self.parsing_switch_expression_block = False
 
+        # Index of the ')' or '}' closing each '(' or '{' in the token list,
+        # built on first use by closing_bracket
+        self.closing_brackets = None
+
 # ------------------------------------------------------------------------------
 # ---- Debug control ----
 
@@ -120,6 +225,14 @@ class Parser(object):
         raise JavaSyntaxError(description, at)
 
     def accept(self, *accepts):
+        # Most calls accept a single keyword or separator
+        if len(accepts) == 1 and type(accepts[0]) is str:
+            token = next(self.tokens)
+            if not token.value == accepts[0]:
+                self.illegal(("Expected '%s'", accepts[0]))
+
+            return token.value
+
         last = None
 
         if len(accepts) == 0:
@@ -127,42 +240,84 @@ class Parser(object):
 
         for accept in accepts:
             token = next(self.tokens)
-            if isinstance(accept, six.string_types) and (
+            if type(accept) is str and (
                     not token.value == accept):
-                self.illegal("Expected '%s'" % (accept,))
+                self.illegal(("Expected '%s'", accept))
             elif isinstance(accept, type) and not isinstance(token, accept):
-                self.illegal("Expected %s" % (accept.__name__,))
+                self.illegal(("Expected %s", accept.__name__))
 
             last = token
 
         return last.value
 
+    def look_value(self, i=0):
+        """ Returns the value of the token i positions ahead, or None past the
+        end of the input.
+
+        """
+
+        index = self.tokens.marker + i
+        values = self.token_values
+
+        if index < len(values):
+            return values[index]
+
+        return None
+
+    def look_kind(self, i=0):
+        """ Returns the kind code of the token i positions ahead, or
+        _OTHER_KIND past the end of the input.
+
+        """
+
+        index = self.tokens.marker + i
+        kinds = self.token_kinds
+
+        if index < len(kinds):
+            return kinds[index]
+
+        return _OTHER_KIND
+
     def would_accept(self, *accepts):
+        index = self.tokens.marker
+        values = self.token_values
+        end = len(values)
+
+        if len(accepts) == 1 and type(accepts[0]) is str:
+            return index < end and values[index] == accepts[0]
+
         if len(accepts) == 0:
             raise JavaParserError("Missing acceptable values")
 
         for i, accept in enumerate(accepts):
-            token = self.tokens.look(i)
-
-            if isinstance(accept, six.string_types) and (
-                    not token.value == accept):
-                return False
-            elif isinstance(accept, type) and not isinstance(token, accept):
+            if type(accept) is str:
+                if index + i >= end or values[index + i] != accept:
+                    return False
+            elif isinstance(accept, type) and not isinstance(self.tokens.look(i), accept):
                 return False
 
         return True
 
     def try_accept(self, *accepts):
+        index = self.tokens.marker
+        values = self.token_values
+        end = len(values)
+
+        if len(accepts) == 1 and type(accepts[0]) is str:
+            if index < end and values[index] == accepts[0]:
+                next(self.tokens)
+                return True
+
+            return False
+
         if len(accepts) == 0:
             raise JavaParserError("Missing acceptable values")
 
         for i, accept in enumerate(accepts):
-            token = self.tokens.look(i)
-
-            if isinstance(accept, six.string_types) and (
-                    not token.value == accept):
-                return False
-            elif isinstance(accept, type) and not isinstance(token, accept):
+            if type(accept) is str:
+                if index + i >= end or values[index + i] != accept:
+                    return False
+            elif isinstance(accept, type) and not isinstance(self.tokens.look(i), accept):
                 return False
 
         for i in range(0, len(accepts)):
@@ -170,56 +325,16 @@ class Parser(object):
 
         return True
 
-    def build_binary_operation(self, parts, start_level=0):
-        if len(parts) == 1:
-            return parts[0]
-
-        operands = list()
-        operators = list()
-
-        i = 0
-
-        for level in range(start_level, len(self.operator_precedence)):
-            for j in range(1, len(parts) - 1, 2):
-                if parts[j] in self.operator_precedence[level]:
-                    operand = self.build_binary_operation(parts[i:j], level + 1)
-                    operator = parts[j]
-                    i = j + 1
-
-                    operands.append(operand)
-                    operators.append(operator)
+    def build_binary_operation(self, operandl, operator, operandr):
+        if operator == 'instanceof' and isinstance(operandr, _PATTERN_NODES):
+            # The pattern's own type is the type being checked against
+            return tree.InstanceOfPatternExpression(expression=operandl,
+                                                    type=operandr.type,
+                                                    pattern=operandr)
 
-            if operands:
-                break
-
-        operand = self.build_binary_operation(parts[i:], level + 1)
-        operands.append(operand)
-
-        operation = operands[0]
-
-        for operator, operandr in zip(operators, operands[1:]):
-            if isinstance(operator, tuple) and operator[0] == 'instanceof_pattern':
-                # operator is ('instanceof_pattern', pattern_node)
-                # pattern_node can be FormalParameter (for Type Pattern) or RecordPattern
-                _, pattern_node = operator
-
-                # Determine the primary type being checked against
-                # For FormalParameter, it's pattern_node.type
-                # For RecordPattern, it's pattern_node.type
-                instanceof_check_type = pattern_node.type
-
-                operation = tree.InstanceOfPatternExpression(expression=operation,
-                                                             type=instanceof_check_type,
-                                                             pattern=pattern_node)
-            elif isinstance(operator, tuple) and operator[0] == 'instanceof_type': # Legacy instanceof
-                _, type_node = operator
-                operation = tree.BinaryOperation(operandl=operation, operator='instanceof', operandr=type_node)
-            else: # Other binary operations
-                op_obj = tree.BinaryOperation(operandl=operation)
-                op_obj.operator = operator
-                op_obj.operandr = operandr
-                operation = op_obj
-        return operation
+        return tree.BinaryOperation(operator=operator,
+                                    operandl=operandl,
+                                    operandr=operandr)
 
     def is_annotation(self, i=0):
         """ Returns true if the position is the start of an annotation application
@@ -227,8 +342,8 @@ class Parser(object):
 
         """
 
-        return (isinstance(self.tokens.look(i), Annotation)
-                and not self.tokens.look(i + 1).value == 'interface')
+        return (self.look_kind(i) == _ANNOTATION_KIND
+                and not self.look_value(i + 1) == 'interface')
 
     def is_annotation_declaration(self, i=0):
         """ Returns true if the position is the start of an annotation application
@@ -236,8 +351,164 @@ class Parser(object):
 
         """
 
-        return (isinstance(self.tokens.look(i), Annotation)
-                and self.tokens.look(i + 1).value == 'interface')
+        return (self.look_kind(i) == _ANNOTATION_KIND
+                and self.look_value(i + 1) == 'interface')
+
+    def is_local_variable_declaration(self, followers=_DECLARATOR_FOLLOWERS):
+        """ Returns true if the tokens at the current position are a type
+        followed by a variable name and one of the given follower values.
+        Nothing is consumed.
+
+        """
+
+        i = self.scan_type()
+
+        return (i is not None
+                and self.look_kind(i) == _IDENTIFIER_KIND
+                and self.look_value(i + 1) in followers)
+
+    def is_lambda_parameters(self):
+        """ Returns true if the '(' at the current position opens a parameter
+        list parse_lambda_expression handles: empty, several untyped names, or
+        formal parameters. Nothing is consumed.
+
+        """
+
+        value = self.look_value(1)
+        if value == ')' or value == 'final' or self.look_kind(1) == _ANNOTATION_KIND:
+            return True
+
+        if self.look_kind(1) == _IDENTIFIER_KIND and self.look_value(2) == ',':
+            return True
+
+        i = self.scan_type(1)
+        if i is not None and self.look_value(i) == '...':
+            i += 1
+
+        return i is not None and self.look_kind(i) == _IDENTIFIER_KIND
+
+    def is_cast(self):
+        """ Returns true if the '(' at the current position opens a cast: the
+        parentheses hold only a type and are followed by the start of an
+        operand. Nothing is consumed.
+
+        """
+
+        close = self.closing_bracket() - self.tokens.marker
+        if self.scan_type(1) != close:
+            return False
+
+        kind = self.look_kind(close + 1)
+        return (kind in _TYPE_ARGUMENT_KINDS
+                or kind == _LITERAL_KIND
+                or self.look_value(close + 1) in _CAST_OPERAND_STARTS)
+
+    def scan_type(self, i=0):
+        """ Returns the look ahead offset just past the type starting at
+        offset i, or None if the tokens there do not form a type. Nothing is
+        consumed.
+
+        """
+
+        look_kind = self.look_kind
+        look_value = self.look_value
+
+        if look_kind(i) == _BASIC_TYPE_KIND:
+            i += 1
+
+        else:
+            i = self.scan_reference_type(i)
+            if i is None:
+                return None
+
+        while look_value(i) == '[' and look_value(i + 1) == ']':
+            i += 2
+
+        return i
+
+    def scan_reference_type(self, i):
+        look_kind = self.look_kind
+        look_value = self.look_value
+
+        while True:
+            if look_kind(i) != _IDENTIFIER_KIND:
+                return None
+            i += 1
+
+            if look_value(i) == '<':
+                depth = 1
+                i += 1
+
+                while depth > 0:
+                    value = look_value(i)
+
+                    if value == '<':
+                        depth += 1
+                    elif value in _TYPE_ARGUMENT_CLOSERS:
+                        depth -= len(value)
+                    elif value == '(':
+                        # Arguments of an annotation on a type argument
+                        i = self.skip_parentheses(i)
+                        continue
+                    elif not (look_kind(i) in _TYPE_ARGUMENT_KINDS
+                              or value in _TYPE_ARGUMENT_TOKENS):
+                        return None
+
+                    i += 1
+
+                if depth < 0:
+                    return None
+
+            if look_value(i) != '.':
+                break
+            i += 1
+
+        return i
+
+    def closing_bracket(self, i=0):
+        """ Returns the token index of the ')' or '}' matching the '(' or '{'
+        at look ahead offset i. For an unbalanced bracket the length of the
+        token list is returned; block bodies use accept_opening_brace, which
+        rejects that case.
+
+        """
+
+        if self.closing_brackets is None:
+            closing_brackets = dict()
+            opened = {'(': list(), '{': list()}
+            opening = {')': opened['('], '}': opened['{']}
+
+            for index, value in enumerate(self.token_values):
+                if value in opened:
+                    opened[value].append(index)
+                elif value in opening and opening[value]:
+                    closing_brackets[opening[value].pop()] = index
+
+            self.closing_brackets = closing_brackets
+
+        return self.closing_brackets.get(self.tokens.marker + i,
+                                         len(self.token_values))
+
+    def skip_parentheses(self, i=0):
+        """ Returns the look ahead offset just past the ')' matching the '(' at
+        offset i. An unbalanced '(' skips to the end of the input.
+
+        """
+
+        return self.closing_bracket(i) - self.tokens.marker + 1
+
+    def accept_opening_brace(self):
+        """ Accepts a '{' and returns the token index of its matching '}'.
+        An unbalanced '{' is a syntax error.
+
+        """
+
+        self.accept('{')
+        end = self.closing_bracket(-1)
+        if end == len(self.token_values):
+            self.illegal("Expected '}'")
+
+        return end
 
 # ------------------------------------------------------------------------------
 # ---- Parsing methods ----
@@ -286,8 +557,11 @@ class Parser(object):
         import_declarations = list()
         declarations_list = list() # Changed from type_declarations
 
-        self.tokens.push_marker()
-        next_token = self.tokens.look()
+        tokens = self.tokens
+        look = tokens.look
+
+        tokens.push_marker()
+        next_token = look()
         if next_token:
             javadoc = next_token.javadoc
 
@@ -295,9 +569,9 @@ class Parser(object):
             package_annotations = self.parse_annotations()
 
         if self.try_accept('package'):
-            self.tokens.pop_marker(False)
+            tokens.pop_marker(False)
             
-            token = self.tokens.look()
+            token = look()
             package_name = self.parse_qualified_identifier()
             package = tree.PackageDeclaration(annotations=package_annotations,
                                               name=package_name,
@@ -306,75 +580,39 @@ class Parser(object):
             
             self.accept(';')
         else:
-            self.tokens.pop_marker(True)
+            tokens.pop_marker(True)
             package_annotations = None
 
-        while self.would_accept('import'):
-            token = self.tokens.look()
+        while look().value == 'import':
+            token = look()
             import_declaration = self.parse_import_declaration()
             import_declaration._position = token.position
             import_declarations.append(import_declaration)
 
-        while not isinstance(self.tokens.look(), EndOfInput):
-            try:
-                type_declaration = self.parse_type_declaration()
-            except StopIteration:
-                self.illegal("Unexpected end of input")
-
-            if self.try_accept(';'): # Skip stray semicolons
-                self.tokens.pop_marker(False) # Consume the marker
-                self.tokens.push_marker() # Push a new one for the next iteration
+        token = look()
+        while not isinstance(token, EndOfInput):
+            if token.value == ';': # Skip stray semicolons
+                next(tokens)
+                token = look()
                 continue
 
-            # For each declaration (type or method)
-            current_javadoc = self.tokens.look().javadoc # Javadoc for this specific declaration
-            self.tokens.push_marker() # Marker for current declaration attempt
+            # For each declaration (type or method). The modifiers are parsed
+            # once and handed to whichever declaration follows them.
+            modifiers, annotations, javadoc = self.parse_modifiers()
 
-            declaration_node = None
-            try:
-                modifiers, annotations, _ = self.parse_modifiers() # Javadoc handled by current_javadoc
-
-                # Dispatch: Try Type Declaration first, then Method Declaration
-                token_after_modifiers = self.tokens.look()
-
-                if token_after_modifiers.value in ('class', 'interface', 'enum', 'record') or \
-                   (isinstance(token_after_modifiers, Annotation) and self.tokens.look(1).value == 'interface'):
-                    # It's a type declaration. parse_class_or_interface_declaration will re-parse modifiers.
-                    # So, we need to backtrack the modifiers we just parsed.
-                    self.tokens.pop_marker(True) # Backtrack modifiers by restoring state before parse_modifiers
-                    self.tokens.push_marker() # Push marker for parse_type_declaration
-                    declaration_node = self.parse_type_declaration() # This parses its own modifiers
-                    if declaration_node is None and self.try_accept(';'): # handle case of just a semicolon
-                        self.tokens.pop_marker(False)
-                        self.tokens.push_marker()
-                        continue
-                else:
-                    # Attempt to parse as a top-level method
-                    # parse_modifiers already consumed relevant parts, pass them directly
-                    declaration_node = self.parse_top_level_method_declaration(modifiers, annotations, current_javadoc)
+            # Dispatch: Try Type Declaration first, then Method Declaration
+            token_after_modifiers = look()
 
-                if declaration_node:
-                    declarations_list.append(declaration_node)
-                    self.tokens.pop_marker(False) # Successfully parsed something, commit
-                else:
-                    # This case should ideally not be reached if parsing is correct and errors are raised
-                    self.tokens.pop_marker(True) # Backtrack if nothing was parsed
-                    if not isinstance(self.tokens.look(), EndOfInput): # Avoid error on trailing comments/whitespace
-                        self.illegal("Expected type or method declaration")
-
-            except JavaSyntaxError as e:
-                self.tokens.pop_marker(True) # Backtrack on error
-                # If after backtracking, it's an EndOfInput, it might just be trailing comments or whitespace.
-                if isinstance(self.tokens.look(), EndOfInput):
-                    break
-                # Re-raise if it's not just trailing content or a successfully skipped semicolon
-                if not self.try_accept(';'):
-                    raise e
-                # If it was a semicolon, loop continues.
-
-            self.tokens.push_marker() # Push marker for the next iteration's initial javadoc/modifier lookahead
+            if token_after_modifiers.value in _TYPE_DECLARATION_KEYWORDS or \
+               (isinstance(token_after_modifiers, Annotation) and look(1).value == 'interface'):
+                declaration_node = self.parse_class_or_interface_declaration_rest(
+                    modifiers, annotations, javadoc)
+            else:
+                # Attempt to parse as a top-level method
+                declaration_node = self.parse_top_level_method_declaration(modifiers, annotations, javadoc)
 
-        self.tokens.pop_marker(False) # Pop the final marker
+            declarations_list.append(declaration_node)
+            token = look()
 
         return tree.CompilationUnit(package=package,
                                     imports=import_declarations,
@@ -419,7 +657,9 @@ class Parser(object):
             # parse_method_declarator_rest sets a dummy return_type for dimensions.
             # We need to preserve these dimensions if the actual return_type_node also has them.
             if method_declaration.return_type and method_declaration.return_type.dimensions:
-                return_type_node.dimensions = (return_type_node.dimensions or []) + method_declaration.return_type.dimensions
+                return_type_node.dimensions = _extend_dimensions(
+                    return_type_node.dimensions,
+                    method_declaration.return_type.dimensions)
 
             method_declaration.name = method_name
             method_declaration.return_type = return_type_node
@@ -474,6 +714,12 @@ class Parser(object):
     @parse_debug
     def parse_class_or_interface_declaration(self):
         modifiers, annotations, javadoc = self.parse_modifiers()
+        return self.parse_class_or_interface_declaration_rest(modifiers,
+                                                              annotations,
+                                                              javadoc)
+
+    @parse_debug
+    def parse_class_or_interface_declaration_rest(self, modifiers, annotations, javadoc):
         type_declaration = None
 
         token = self.tokens.look()
@@ -512,15 +758,7 @@ class Parser(object):
         if self.would_accept('<'):
             type_params = self.parse_type_parameters()
 
-        if self.try_accept('extends'):
-            extends = self.parse_type()
-
-        if self.try_accept('implements'):
-            implements = self.parse_type_list()
-
-        permits_types = None
-        if self.try_accept('permits'):
-            permits_types = self.parse_type_list()
+        extends, implements, permits_types = self.parse_class_header_clauses()
 
         body = self.parse_class_body()
 
@@ -562,12 +800,7 @@ class Parser(object):
         if self.would_accept('<'):
             type_parameters = self.parse_type_parameters()
 
-        if self.try_accept('extends'):
-            extends = self.parse_type_list()
-
-        permits_types = None
-        if self.try_accept('permits'):
-            permits_types = self.parse_type_list()
+        extends, _, permits_types = self.parse_class_header_clauses(interface=True)
 
         body = self.parse_interface_body()
 
@@ -577,6 +810,39 @@ class Parser(object):
                                          permits=permits_types,
                                          body=body)
 
+    @parse_debug
+    def parse_class_header_clauses(self, interface=False):
+        """ Parses the optional extends, implements and permits clauses of a
+        class or interface header, looking at each token only once.
+
+        """
+
+        extends = None
+        implements = None
+        permits = None
+
+        tokens = self.tokens
+        value = tokens.look().value
+
+        if value == 'extends':
+            next(tokens)
+            if interface:
+                extends = self.parse_type_list()
+            else:
+                extends = self.parse_type()
+            value = tokens.look().value
+
+        if value == 'implements' and not interface:
+            next(tokens)
+            implements = self.parse_type_list()
+            value = tokens.look().value
+
+        if value == 'permits':
+            next(tokens)
+            permits = self.parse_type_list()
+
+        return (extends, implements, permits)
+
     @parse_debug
     def parse_annotation_type_declaration(self):
         name = None
@@ -660,9 +926,11 @@ class Parser(object):
     def parse_type(self):
         java_type = None
 
-        if isinstance(self.tokens.look(), BasicType):
+        kind = self.look_kind()
+
+        if kind == _BASIC_TYPE_KIND:
             java_type = self.parse_basic_type()
-        elif isinstance(self.tokens.look(), Identifier):
+        elif kind == _IDENTIFIER_KIND:
             java_type = self.parse_reference_type()
         else:
             self.illegal("Expected type")
@@ -697,14 +965,16 @@ class Parser(object):
     @parse_debug
     def parse_type_arguments(self):
         type_arguments = list()
+        try_accept = self.try_accept
+        parse_type_argument = self.parse_type_argument
 
         self.accept('<')
 
         while True:
-            type_argument = self.parse_type_argument()
+            type_argument = parse_type_argument()
             type_arguments.append(type_argument)
 
-            if self.try_accept('>'):
+            if try_accept('>'):
                 break
 
             self.accept(',')
@@ -717,12 +987,12 @@ class Parser(object):
         base_type = None
 
         if self.try_accept('?'):
-            if self.tokens.look().value in ('extends', 'super'):
+            if self.look_value() in _WILDCARD_BOUNDS:
                 pattern_type = self.tokens.next().value
             else:
                 return tree.TypeArgument(pattern_type='?')
 
-        if self.would_accept(BasicType):
+        if self.look_kind() == _BASIC_TYPE_KIND:
             base_type = self.parse_basic_type()
             self.accept('[', ']')
             base_type.dimensions = [None]
@@ -746,9 +1016,11 @@ class Parser(object):
     @parse_debug
     def parse_type_list(self):
         types = list()
+        look_kind = self.look_kind
+        try_accept = self.try_accept
 
         while True:
-            if self.would_accept(BasicType):
+            if look_kind() == _BASIC_TYPE_KIND:
                 base_type = self.parse_basic_type()
                 self.accept('[', ']')
                 base_type.dimensions = [None]
@@ -759,7 +1031,7 @@ class Parser(object):
             base_type.dimensions += self.parse_array_dimension()
             types.append(base_type)
 
-            if not self.try_accept(','):
+            if not try_accept(','):
                 break
 
         return types
@@ -815,6 +1087,13 @@ class Parser(object):
 
     @parse_debug
     def parse_array_dimension(self):
+        # Almost every type has no dimensions, so share a single immutable
+        # empty value rather than allocating a new list each time. Callers
+        # add trailing dimensions with _extend_dimensions().
+        look = self.tokens.look
+        if look().value != '[' or look(1).value != ']':
+            return _EMPTY_DIMENSIONS
+
         array_dimension = 0
 
         while self.try_accept('[', ']'):
@@ -827,41 +1106,61 @@ class Parser(object):
 
     @parse_debug
     def parse_modifiers(self):
-        annotations = list()
-        modifiers = set()
-        javadoc = None
+        annotations = None
+        modifiers = None
 
-        next_token = self.tokens.look()
-        if next_token:
-            javadoc = next_token.javadoc
+        tokens = self.tokens
+        look = tokens.look
+
+        token = look()
+        javadoc = token.javadoc
 
+        # Fetch each token once and dispatch on its exact class rather than
+        # going through would_accept() and is_annotation()
         while True:
-            token = self.tokens.look()
-            if self.would_accept(Modifier):
-                modifiers.add(self.accept(Modifier))
+            token_type = type(token)
 
-            elif self.is_annotation():
+            if token_type is Modifier:
+                if modifiers is None:
+                    modifiers = set()
+                modifiers.add(token.value)
+                next(tokens)
+
+            elif token_type is Annotation and look(1).value != 'interface':
                 annotation = self.parse_annotation()
                 annotation._position = token.position
+                if annotations is None:
+                    annotations = list()
                 annotations.append(annotation)
 
             else:
                 break
 
-        return (modifiers, annotations, javadoc)
+            token = look()
+
+        if modifiers is None:
+            modifiers = _EMPTY_MODIFIERS
+        else:
+            modifiers = frozenset(modifiers)
+            modifiers = _MODIFIER_SETS.setdefault(modifiers, modifiers)
+
+        return (modifiers,
+                annotations or _EMPTY_ANNOTATIONS,
+                javadoc)
 
     @parse_debug
     def parse_annotations(self):
         annotations = list()
+        look = self.tokens.look
 
+        token = look()
         while True:
-            token = self.tokens.look()
-            
             annotation = self.parse_annotation()
             annotation._position = token.position
             annotations.append(annotation)
 
-            if not self.is_annotation():
+            token = look()
+            if type(token) is not Annotation or look(1).value == 'interface':
                 break
 
         return annotations
@@ -961,11 +1260,13 @@ class Parser(object):
     @parse_debug
     def parse_class_body(self):
         declarations = list()
+        tokens = self.tokens
+        parse_class_body_declaration = self.parse_class_body_declaration
 
-        self.accept('{')
+        end = self.accept_opening_brace()
 
-        while not self.would_accept('}'):
-            declaration = self.parse_class_body_declaration()
+        while tokens.marker < end:
+            declaration = parse_class_body_declaration()
             if declaration:
                 declarations.append(declaration)
 
@@ -996,27 +1297,15 @@ class Parser(object):
         member = None
 
         token = self.tokens.look()
-        if self.try_accept('void'):
-            method_name = self.parse_identifier()
-            member = self.parse_void_method_declarator_rest()
-            member.name = method_name
-
-        elif token.value == '<':
-            member = self.parse_generic_method_or_constructor_declaration()
-
-        elif token.value == 'class':
-            member = self.parse_normal_class_declaration()
+        handler = self.member_parsers.get(token.value)
 
-        elif token.value == 'enum':
-            member = self.parse_enum_declaration()
-
-        elif token.value == 'interface':
-            member = self.parse_normal_interface_declaration()
+        if handler is not None:
+            member = handler(self)
 
-        elif self.is_annotation_declaration():
+        elif self.look_kind() == _ANNOTATION_KIND and self.look_value(1) == 'interface':
             member = self.parse_annotation_type_declaration()
 
-        elif self.would_accept(Identifier, '('):
+        elif self.look_kind() == _IDENTIFIER_KIND and self.look_value(1) == '(':
             constructor_name = self.parse_identifier()
             member = self.parse_constructor_declarator_rest()
             member.name = constructor_name
@@ -1039,7 +1328,8 @@ class Parser(object):
         member = self.parse_method_or_field_rest()
 
         if isinstance(member, tree.MethodDeclaration):
-            member_type.dimensions += member.return_type.dimensions
+            member_type.dimensions = _extend_dimensions(
+                member_type.dimensions, member.return_type.dimensions)
 
             member.name = member_name
             member.return_type = member_type
@@ -1076,16 +1366,7 @@ class Parser(object):
     def parse_method_declarator_rest(self):
         formal_parameters = self.parse_formal_parameters()
         additional_dimensions = self.parse_array_dimension()
-        throws = None
-        body = None
-
-        if self.try_accept('throws'):
-            throws = self.parse_qualified_identifier_list()
-
-        if self.would_accept('{'):
-            body = self.parse_block()
-        else:
-            self.accept(';')
+        throws, body = self.parse_method_throws_and_body()
 
         return tree.MethodDeclaration(parameters=formal_parameters,
                                      throws=throws,
@@ -1095,31 +1376,49 @@ class Parser(object):
     @parse_debug
     def parse_void_method_declarator_rest(self):
         formal_parameters = self.parse_formal_parameters()
+        throws, body = self.parse_method_throws_and_body()
+
+        return tree.MethodDeclaration(parameters=formal_parameters,
+                                      throws=throws,
+                                      body=body)
+
+    @parse_debug
+    def parse_method_throws_and_body(self, require_body=False):
+        """ Parses the optional throws clause and then the body of a method or
+        constructor, or the ';' ending an abstract method. Returns a
+        (throws, body) tuple.
+
+        """
+
         throws = None
         body = None
 
-        if self.try_accept('throws'):
+        value = self.look_value()
+        if value == 'throws':
+            next(self.tokens)
             throws = self.parse_qualified_identifier_list()
+            value = self.look_value()
 
-        if self.would_accept('{'):
+        if value == '{' or require_body:
             body = self.parse_block()
         else:
             self.accept(';')
 
-        return tree.MethodDeclaration(parameters=formal_parameters,
-                                      throws=throws,
-                                      body=body)
+        return (throws, body)
 
     @parse_debug
-    def parse_constructor_declarator_rest(self):
-        formal_parameters = self.parse_formal_parameters()
-        throws = None
-        body = None
+    def parse_void_method_declaration(self):
+        self.accept('void')
+        method_name = self.parse_identifier()
+        method = self.parse_void_method_declarator_rest()
+        method.name = method_name
 
-        if self.try_accept('throws'):
-            throws = self.parse_qualified_identifier_list()
+        return method
 
-        body = self.parse_block()
+    @parse_debug
+    def parse_constructor_declarator_rest(self):
+        formal_parameters = self.parse_formal_parameters()
+        throws, body = self.parse_method_throws_and_body(require_body=True)
 
         return tree.ConstructorDeclaration(parameters=formal_parameters,
                                            throws=throws,
@@ -1131,14 +1430,12 @@ class Parser(object):
         method = None
 
         token = self.tokens.look()
-        if self.would_accept(Identifier, '('):
+        if self.look_kind() == _IDENTIFIER_KIND and self.look_value(1) == '(':
             constructor_name = self.parse_identifier()
             method = self.parse_constructor_declarator_rest()
             method.name = constructor_name
-        elif self.try_accept('void'):
-            method_name = self.parse_identifier()
-            method = self.parse_void_method_declarator_rest()
-            method.name = method_name
+        elif token.value == 'void':
+            method = self.parse_void_method_declaration()
 
         else:
             method_return_type = self.parse_type()
@@ -1146,7 +1443,8 @@ class Parser(object):
 
             method = self.parse_method_declarator_rest()
 
-            method_return_type.dimensions += method.return_type.dimensions
+            method_return_type.dimensions = _extend_dimensions(
+                method_return_type.dimensions, method.return_type.dimensions)
             method.return_type = method_return_type
             method.name = method_name
 
@@ -1154,16 +1452,28 @@ class Parser(object):
         method.type_parameters = type_parameters
         return method
 
+    # Member declarations led by a fixed token, looked up by its value
+    member_parsers = {
+        'void': parse_void_method_declaration,
+        '<': parse_generic_method_or_constructor_declaration,
+        'class': parse_normal_class_declaration,
+        'enum': parse_enum_declaration,
+        'interface': parse_normal_interface_declaration,
+    }
+
 # ------------------------------------------------------------------------------
 # -- Interface body --
 
     @parse_debug
     def parse_interface_body(self):
         declarations = list()
+        tokens = self.tokens
+        parse_interface_body_declaration = self.parse_interface_body_declaration
 
-        self.accept('{')
-        while not self.would_accept('}'):
-            declaration = self.parse_interface_body_declaration()
+        end = self.accept_opening_brace()
+
+        while tokens.marker < end:
+            declaration = parse_interface_body_declaration()
 
             if declaration:
                 declarations.append(declaration)
@@ -1190,20 +1500,12 @@ class Parser(object):
         declaration = None
 
         token = self.tokens.look()
-        if self.would_accept('class'):
-            declaration = self.parse_normal_class_declaration()
-        elif self.would_accept('interface'):
-            declaration = self.parse_normal_interface_declaration()
-        elif self.would_accept('enum'):
-            declaration = self.parse_enum_declaration()
-        elif self.is_annotation_declaration():
+        handler = self.interface_member_parsers.get(token.value)
+
+        if handler is not None:
+            declaration = handler(self)
+        elif self.look_kind() == _ANNOTATION_KIND and self.look_value(1) == 'interface':
             declaration = self.parse_annotation_type_declaration()
-        elif self.would_accept('<'):
-            declaration = self.parse_interface_generic_method_declarator()
-        elif self.try_accept('void'):
-            method_name = self.parse_identifier()
-            declaration = self.parse_void_interface_method_declarator_rest()
-            declaration.name = method_name
         else:
             declaration = self.parse_interface_method_or_field_declaration()
 
@@ -1218,7 +1520,8 @@ class Parser(object):
         member = self.parse_interface_method_or_field_rest()
 
         if isinstance(member, tree.MethodDeclaration):
-            java_type.dimensions += member.return_type.dimensions
+            java_type.dimensions = _extend_dimensions(
+                java_type.dimensions, member.return_type.dimensions)
             member.name = name
             member.return_type = java_type
         else:
@@ -1272,16 +1575,7 @@ class Parser(object):
     def parse_interface_method_declarator_rest(self):
         parameters = self.parse_formal_parameters()
         array_dimension = self.parse_array_dimension()
-        throws = None
-        body = None
-
-        if self.try_accept('throws'):
-            throws = self.parse_qualified_identifier_list()
-
-        if self.would_accept('{'):
-            body = self.parse_block()
-        else:
-            self.accept(';')
+        throws, body = self.parse_method_throws_and_body()
 
         return tree.MethodDeclaration(parameters=parameters,
                                       throws=throws,
@@ -1289,18 +1583,18 @@ class Parser(object):
                                       return_type=tree.Type(dimensions=array_dimension))
 
     @parse_debug
-    def parse_void_interface_method_declarator_rest(self):
-        parameters = self.parse_formal_parameters()
-        throws = None
-        body = None
+    def parse_void_interface_method_declaration(self):
+        self.accept('void')
+        method_name = self.parse_identifier()
+        declaration = self.parse_void_interface_method_declarator_rest()
+        declaration.name = method_name
 
-        if self.try_accept('throws'):
-            throws = self.parse_qualified_identifier_list()
+        return declaration
 
-        if self.would_accept('{'):
-            body = self.parse_block()
-        else:
-            self.accept(';')
+    @parse_debug
+    def parse_void_interface_method_declarator_rest(self):
+        parameters = self.parse_formal_parameters()
+        throws, body = self.parse_method_throws_and_body()
 
         return tree.MethodDeclaration(parameters=parameters,
                                       throws=throws,
@@ -1323,30 +1617,43 @@ class Parser(object):
 
         return method
 
+    # Interface member declarations led by a fixed token, looked up by its value
+    interface_member_parsers = {
+        'class': parse_normal_class_declaration,
+        'interface': parse_normal_interface_declaration,
+        'enum': parse_enum_declaration,
+        '<': parse_interface_generic_method_declarator,
+        'void': parse_void_interface_method_declaration,
+    }
+
 # ------------------------------------------------------------------------------
 # -- Parameters and variables --
 
     @parse_debug
     def parse_formal_parameters(self):
-        formal_parameters = list()
-
         self.accept('(')
 
         if self.try_accept(')'):
-            return formal_parameters
+            return _EMPTY_PARAMETERS
+
+        formal_parameters = list()
+
+        look = self.tokens.look
+        try_accept = self.try_accept
 
         while True:
             modifiers, annotations = self.parse_variable_modifiers()
-            
-            token = self.tokens.look()
+
+            token = look()
             parameter_type = self.parse_type()
             varargs = False
 
-            if self.try_accept('...'):
+            if try_accept('...'):
                 varargs = True
 
             parameter_name = self.parse_identifier()
-            parameter_type.dimensions += self.parse_array_dimension()
+            parameter_type.dimensions = _extend_dimensions(
+                parameter_type.dimensions, self.parse_array_dimension())
 
             parameter = tree.FormalParameter(modifiers=modifiers,
                                              annotations=annotations,
@@ -1361,7 +1668,7 @@ class Parser(object):
                 # varargs parameter must be the last
                 break
 
-            if not self.try_accept(','):
+            if not try_accept(','):
                 break
 
         self.accept(')')
@@ -1370,21 +1677,26 @@ class Parser(object):
 
     @parse_debug
     def parse_variable_modifiers(self):
-        modifiers = set()
-        annotations = list()
+        modifiers = _EMPTY_MODIFIERS
+        annotations = None
 
+        # 'final' is the only modifier allowed here, so the result is always
+        # one of two shared sets
         while True:
             token = self.tokens.look()
-            if self.try_accept('final'):
-                modifiers.add('final')
+            if token.value == 'final':
+                next(self.tokens)
+                modifiers = _FINAL_MODIFIERS
             elif self.is_annotation():
                 annotation = self.parse_annotation()
                 annotation._position = token.position
+                if annotations is None:
+                    annotations = list()
                 annotations.append(annotation)
             else:
                 break
 
-        return modifiers, annotations
+        return modifiers, annotations or _EMPTY_ANNOTATIONS
 
     @parse_debug
     def parse_variable_declators(self):
@@ -1402,12 +1714,14 @@ class Parser(object):
     @parse_debug
     def parse_variable_declarators(self):
         declarators = list()
+        try_accept = self.try_accept
+        parse_variable_declarator = self.parse_variable_declarator
 
         while True:
-            declarator = self.parse_variable_declarator()
+            declarator = parse_variable_declarator()
             declarators.append(declarator)
 
-            if not self.try_accept(','):
+            if not try_accept(','):
                 break
 
         return declarators
@@ -1451,14 +1765,19 @@ class Parser(object):
         if self.try_accept('}'):
             return array_initializer
 
+        initializers = array_initializer.initializers
+        look = self.tokens.look
+        try_accept = self.try_accept
+        parse_variable_initializer = self.parse_variable_initializer
+
         while True:
-            initializer = self.parse_variable_initializer()
-            array_initializer.initializers.append(initializer)
+            initializer = parse_variable_initializer()
+            initializers.append(initializer)
 
-            if not self.would_accept('}'):
+            if look().value != '}':
                 self.accept(',')
 
-            if self.try_accept('}'):
+            if try_accept('}'):
                 return array_initializer
 
 # ------------------------------------------------------------------------------
@@ -1467,11 +1786,15 @@ class Parser(object):
     @parse_debug
     def parse_block(self):
         statements = list()
+        tokens = self.tokens
+        parse_block_statement = self.parse_block_statement
 
-        self.accept('{')
+        # The matching '}' is known up front, so the loop needs no probe of
+        # the next token
+        end = self.accept_opening_brace()
 
-        while not self.would_accept('}'):
-            statement = self.parse_block_statement()
+        while tokens.marker < end:
+            statement = parse_block_statement()
             statements.append(statement)
         self.accept('}')
 
@@ -1479,55 +1802,50 @@ class Parser(object):
 
     @parse_debug
     def parse_block_statement(self):
-        if self.would_accept(Identifier, ':'):
+        look_kind = self.look_kind
+        look_value = self.look_value
+
+        kind = look_kind()
+        if kind == _IDENTIFIER_KIND and look_value(1) == ':':
             # Labeled statement
             return self.parse_statement()
 
-        if self.would_accept('synchronized'):
+        if look_value() == 'synchronized':
             return self.parse_statement()
 
-        token = None
         found_annotations = False
         i = 0
 
         # Look past annoatations and modifiers. If we find a modifier that is not
         # 'final' then the statement must be a class or interface declaration
         while True:
-            token = self.tokens.look(i)
-
-            if isinstance(token, Modifier):
-                if not token.value == 'final':
+            if kind == _MODIFIER_KIND:
+                if not look_value(i) == 'final':
                     return self.parse_class_or_interface_declaration()
 
-            elif self.is_annotation(i):
+                i += 1
+
+            elif kind == _ANNOTATION_KIND and look_value(i + 1) != 'interface':
                 found_annotations = True
 
                 i += 2
-                while self.tokens.look(i).value == '.':
+                while look_value(i) == '.':
                     i += 2
 
-                if self.tokens.look(i).value == '(':
-                    parens = 1
-                    i += 1
-
-                    while parens > 0:
-                        token = self.tokens.look(i)
-                        if token.value == '(':
-                            parens += 1
-                        elif token.value == ')':
-                            parens -= 1
-                        i += 1
-                    continue
+                if look_value(i) == '(':
+                    i = self.skip_parentheses(i)
 
             else:
                 break
 
-            i += 1
+            kind = look_kind(i)
+
+        token = self.tokens.look(i)
 
-        if token.value in ('class', 'enum', 'interface', '@'):
+        if token.value in _LOCAL_TYPE_DECLARATION_STARTS:
             return self.parse_class_or_interface_declaration()
 
-        if found_annotations or isinstance(token, BasicType):
+        if found_annotations or kind == _BASIC_TYPE_KIND or token.value == 'var':
             statement = self.parse_local_variable_declaration_statement()
             statement._position = token.position
             return statement
@@ -1535,18 +1853,17 @@ class Parser(object):
         # At this point, if the block statement is a variable definition the next
         # token MUST be an identifier, so if it isn't we can conclude the block
         # statement is a normal statement
-        if not isinstance(token, Identifier):
+        if kind != _IDENTIFIER_KIND:
             return self.parse_statement()
 
-        # We can't easily determine the statement type. Try parsing as a variable
-        # declaration first and fall back to a statement
-        try:
-            with self.tokens:
-                statement = self.parse_local_variable_declaration_statement()
-                statement._position = token.position
-                return statement
-        except JavaSyntaxError:
-            return self.parse_statement()
+        # Scan ahead for a type followed by a variable name to decide between
+        # a variable declaration and a normal statement
+        if self.is_local_variable_declaration():
+            statement = self.parse_local_variable_declaration_statement()
+            statement._position = token.position
+            return statement
+
+        return self.parse_statement()
 
     @parse_debug
     def parse_local_variable_declaration_statement(self):
@@ -1579,18 +1896,22 @@ class Parser(object):
     @parse_debug
     def parse_statement(self):
         token = self.tokens.look()
-        if self.would_accept('{'):
-            block = self.parse_block()
-            statement = tree.BlockStatement(statements=block)
-            statement._position = token.position
-            return statement
+        value = token.value
 
-        elif self.try_accept(';'):
-            statement = tree.Statement()
-            statement._position = token.position
-            return statement
+        # Statements starting with a keyword are dispatched on its value
+        # with a single lookup; the keyword is consumed before the handler
+        # is called
+        handler = self.statement_parsers.get(value)
+        if handler is not None:
+            next(self.tokens)
+            return handler(self, token)
+
+        # Identifier-led statements are either labels or, far more often,
+        # expression statements, so they skip the remaining checks
+        if self.look_kind() == _IDENTIFIER_KIND:
+            if self.look_value(1) != ':':
+                return self.parse_expression_statement(token)
 
-        elif self.would_accept(Identifier, ':'):
             identifer = self.parse_identifier()
             self.accept(':')
 
@@ -1600,183 +1921,201 @@ class Parser(object):
 
             return statement
 
-        elif self.try_accept('if'):
-            condition = self.parse_par_expression()
-            then = self.parse_statement()
-            else_statement = None
+        if value == '{':
+            block = self.parse_block()
+            return tree.BlockStatement(statements=block,
+                                       _position=token.position)
 
-            if self.try_accept('else'):
-                else_statement = self.parse_statement()
+        elif value == ';':
+            next(self.tokens)
+            return tree.Statement(_position=token.position)
 
-            statement = tree.IfStatement(condition=condition,
-                                    then_statement=then,
-                                    else_statement=else_statement)
-            statement._position = token.position
-            return statement
+        # 'yield' is only a keyword inside a switch expression block, so it
+        # can't go through statement_parsers, which consume the keyword first
+        elif value == 'yield' and self.parsing_switch_expression_block:
+            next(self.tokens)
+            return self.parse_yield_statement(token)
 
-        elif self.try_accept('assert'):
-            condition = self.parse_expression()
-            value = None
+        else:
+            return self.parse_expression_statement(token)
 
-            if self.try_accept(':'):
-                value = self.parse_expression()
+    @parse_debug
+    def parse_expression_statement(self, token):
+        expression = self.parse_expression()
+        self.accept(';')
 
-            self.accept(';')
+        return tree.StatementExpression(expression=expression,
+                                        _position=token.position)
 
-            statement = tree.AssertStatement(condition=condition, value=value)
-            statement._position = token.position
-            return statement
+    @parse_debug
+    def parse_if_statement(self, token):
+        condition = self.parse_par_expression()
+        then = self.parse_statement()
+        else_statement = None
 
-        elif self.try_accept('switch'):
-            switch_expression = self.parse_par_expression()
-            self.accept('{')
-            switch_block = self.parse_switch_block_statement_groups()
-            self.accept('}')
+        if self.try_accept('else'):
+            else_statement = self.parse_statement()
 
-            statement = tree.SwitchStatement(expression=switch_expression, cases=switch_block)
-            statement._position = token.position
-            return statement
+        return tree.IfStatement(condition=condition,
+                                then_statement=then,
+                                else_statement=else_statement,
+                                _position=token.position)
 
-        elif self.try_accept('while'):
-            condition = self.parse_par_expression()
-            action = self.parse_statement()
+    @parse_debug
+    def parse_assert_statement(self, token):
+        condition = self.parse_expression()
+        value = None
 
-            statement = tree.WhileStatement(condition=condition, body=action)
-            statement._position = token.position
-            return statement
+        if self.try_accept(':'):
+            value = self.parse_expression()
 
-        elif self.try_accept('do'):
-            action = self.parse_statement()
-            self.accept('while')
-            condition = self.parse_par_expression()
-            self.accept(';')
+        self.accept(';')
 
-            statement = tree.DoStatement(condition=condition, body=action)
-            statement._position = token.position
-            return statement
+        return tree.AssertStatement(condition=condition, value=value,
+                                    _position=token.position)
 
-        elif self.try_accept('for'):
-            self.accept('(')
-            for_control = self.parse_for_control()
-            self.accept(')')
-            for_statement = self.parse_statement()
+    @parse_debug
+    def parse_switch_statement(self, token):
+        switch_expression = self.parse_par_expression()
+        self.accept('{')
+        switch_block = self.parse_switch_block_statement_groups()
+        self.accept('}')
 
-            statement = tree.ForStatement(control=for_control, body=for_statement)
-            statement._position = token.position
-            return statement
+        return tree.SwitchStatement(expression=switch_expression, cases=switch_block,
+                                    _position=token.position)
 
-        elif self.try_accept('break'):
-            label = None
+    @parse_debug
+    def parse_while_statement(self, token):
+        condition = self.parse_par_expression()
+        action = self.parse_statement()
 
-            if self.would_accept(Identifier):
-                label = self.parse_identifier()
+        return tree.WhileStatement(condition=condition, body=action,
+                                   _position=token.position)
 
-            self.accept(';')
+    @parse_debug
+    def parse_do_statement(self, token):
+        action = self.parse_statement()
+        self.accept('while')
+        condition = self.parse_par_expression()
+        self.accept(';')
 
-            statement = tree.BreakStatement(goto=label)
-            statement._position = token.position
-            return statement
+        return tree.DoStatement(condition=condition, body=action,
+                                _position=token.position)
 
-        elif self.try_accept('continue'):
-            label = None
+    @parse_debug
+    def parse_for_statement(self, token):
+        self.accept('(')
+        for_control = self.parse_for_control()
+        self.accept(')')
+        for_statement = self.parse_statement()
 
-            if self.would_accept(Identifier):
-                label = self.parse_identifier()
+        return tree.ForStatement(control=for_control, body=for_statement,
+                                 _position=token.position)
 
-            self.accept(';')
+    @parse_debug
+    def parse_break_statement(self, token):
+        label = None
 
-            statement = tree.ContinueStatement(goto=label)
-            statement._position = token.position
-            return statement
+        if self.look_kind() == _IDENTIFIER_KIND:
+            label = self.parse_identifier()
 
-        elif self.try_accept('return'):
-            value = None
+        self.accept(';')
 
-            if not self.would_accept(';'):
-                value = self.parse_expression()
+        return tree.BreakStatement(goto=label, _position=token.position)
 
-            self.accept(';')
+    @parse_debug
+    def parse_continue_statement(self, token):
+        label = None
 
-            statement = tree.ReturnStatement(expression=value)
-            statement._position = token.position
-            return statement
+        if self.look_kind() == _IDENTIFIER_KIND:
+            label = self.parse_identifier()
 
-        elif self.try_accept('throw'):
-            value = self.parse_expression()
-            self.accept(';')
+        self.accept(';')
 
-            statement = tree.ThrowStatement(expression=value)
-            statement._position = token.position
-            return statement
+        return tree.ContinueStatement(goto=label, _position=token.position)
 
-        elif self.try_accept('synchronized'):
-            lock = self.parse_par_expression()
-            block = self.parse_block()
+    @parse_debug
+    def parse_return_statement(self, token):
+        value = None
 
-            statement = tree.SynchronizedStatement(lock=lock, block=block)
-            statement._position = token.position
-            return statement
+        if not self.would_accept(';'):
+            value = self.parse_expression()
 
-        elif self.try_accept('try'):
-            resource_specification = None
-            block = None
-            catches = None
-            finally_block = None
+        self.accept(';')
 
-            if self.would_accept('{'):
-                block = self.parse_block()
+        return tree.ReturnStatement(expression=value, _position=token.position)
+
+    @parse_debug
+    def parse_throw_statement(self, token):
+        value = self.parse_expression()
+        self.accept(';')
 
-                if self.would_accept('catch'):
-                    catches = self.parse_catches()
+        return tree.ThrowStatement(expression=value, _position=token.position)
 
-                if self.try_accept('finally'):
-                    finally_block = self.parse_block()
+    @parse_debug
+    def parse_synchronized_statement(self, token):
+        lock = self.parse_par_expression()
+        block = self.parse_block()
 
-                if catches == None and finally_block == None:
-                    self.illegal("Expected catch/finally block")
+        return tree.SynchronizedStatement(lock=lock, block=block,
+                                          _position=token.position)
 
-            else:
-                resource_specification = self.parse_resource_specification()
-                block = self.parse_block()
+    @parse_debug
+    def parse_try_statement(self, token):
+        resource_specification = None
+        block = None
+        catches = None
+        finally_block = None
 
-                if self.would_accept('catch'):
-                    catches = self.parse_catches()
+        if self.would_accept('{'):
+            block = self.parse_block()
 
-                if self.try_accept('finally'):
-                    finally_block = self.parse_block()
+            if self.would_accept('catch'):
+                catches = self.parse_catches()
 
-            statement = tree.TryStatement(resources=resource_specification,
-                                     block=block,
-                                     catches=catches,
-                                     finally_block=finally_block)
-            statement._position = token.position
-            return statement
+            if self.try_accept('finally'):
+                finally_block = self.parse_block()
+
+            if catches == None and finally_block == None:
+                self.illegal("Expected catch/finally block")
 
         else:
-            expression = self.parse_expression()
-            self.accept(';')
+            resource_specification = self.parse_resource_specification()
+            block = self.parse_block()
 
-            statement = tree.StatementExpression(expression=expression)
-            statement._position = token.position
-            return statement
+            if self.would_accept('catch'):
+                catches = self.parse_catches()
 
-        # yield must be checked before attempting to parse a general expression statement
-        elif self.try_accept('yield') and self.parsing_switch_expression_block:
-            # This is context-sensitive: 'yield' is only a keyword here
-            # if self.parsing_switch_expression_block is True.
-            value = self.parse_expression()
-            self.accept(';')
-            statement = tree.YieldStatement(expression=value)
-            statement._position = token.position
-            return statement
+            if self.try_accept('finally'):
+                finally_block = self.parse_block()
 
-        else: # Default to expression statement
-            expression = self.parse_expression()
-            self.accept(';')
+        return tree.TryStatement(resources=resource_specification,
+                                 block=block,
+                                 catches=catches,
+                                 finally_block=finally_block,
+                                 _position=token.position)
 
-            statement = tree.StatementExpression(expression=expression)
-            statement._position = token.position
-            return statement
+    @parse_debug
+    def parse_yield_statement(self, token):
+        value = self.parse_expression()
+        self.accept(';')
+
+        return tree.YieldStatement(expression=value, _position=token.position)
+
+    statement_parsers = {
+        'if': parse_if_statement,
+        'assert': parse_assert_statement,
+        'switch': parse_switch_statement,
+        'while': parse_while_statement,
+        'do': parse_do_statement,
+        'for': parse_for_statement,
+        'break': parse_break_statement,
+        'continue': parse_continue_statement,
+        'return': parse_return_statement,
+        'throw': parse_throw_statement,
+        'synchronized': parse_synchronized_statement,
+        'try': parse_try_statement,
+    }
 
 # ------------------------------------------------------------------------------
 # -- Switch Expression --
@@ -1818,8 +2157,8 @@ class Parser(object):
                 # Let's assume `var name` means name is the pattern.
                 component_pattern = tree.FormalParameter(type=var_type_node,
                                                          name=var_name,
-                                                         modifiers=set(),
-                                                         annotations=[],
+                                                         modifiers=_EMPTY_MODIFIERS,
+                                                         annotations=_EMPTY_ANNOTATIONS,
                                                          _position=component_token_pos.position)
             else:
                 # Try to parse as Type identifier or nested RecordPattern
@@ -1851,16 +2190,16 @@ class Parser(object):
                     component_name = self.parse_identifier()
                     component_pattern = tree.FormalParameter(type=parsed_type,
                                                              name=component_name,
-                                                             modifiers=set(),
-                                                             annotations=[],
+                                                             modifiers=_EMPTY_MODIFIERS,
+                                                             annotations=_EMPTY_ANNOTATIONS,
                                                              _position=component_token_pos.position)
 
                 elif isinstance(self.tokens.look(), Identifier): # Type identifier
                     component_name = self.parse_identifier()
                     component_pattern = tree.FormalParameter(type=parsed_type,
                                                              name=component_name,
-                                                             modifiers=set(),
-                                                             annotations=[],
+                                                             modifiers=_EMPTY_MODIFIERS,
+                                                             annotations=_EMPTY_ANNOTATIONS,
                                                              _position=component_token_pos.position)
                 else:
                     self.illegal("Expected identifier or nested pattern in record component")
@@ -1882,110 +2221,68 @@ class Parser(object):
         - An expression (constant)
         Returns an AST node representing the label.
         """
-        token_pos_ref = self.tokens.look()
+        tokens = self.tokens
+        look = tokens.look
+        token_pos_ref = look()
 
-        if self.would_accept('null'):
+        if token_pos_ref.value == 'null':
             # Handle 'null' label
-            if not isinstance(self.tokens.look(1), Identifier):
-                self.accept('null')
+            if not isinstance(look(1), Identifier):
+                next(tokens)
                 return tree.Literal(value='null', _position=token_pos_ref.position)
 
-        # Try parsing as a Type, then check for record pattern or type pattern
-        self.tokens.push_marker()
-        try:
-            potential_record_type = self.parse_type()
+        # Classify the label from the shape of the type at its start, so that
+        # constant labels are parsed once, as an expression
+        i = self.scan_type()
+        if i is not None:
+            value = self.look_value(i)
 
-            # Check for Record Pattern: Type(...)
-            if self.would_accept('('):
-                # Pass the parsed type as the record's type
-                components = self.parse_record_pattern_components(potential_record_type)
-                self.tokens.pop_marker(accept=True) # Commit
-                return tree.RecordPattern(type=potential_record_type,
-                                          components=components,
-                                          _position=token_pos_ref.position)
+            # Check for Record Pattern: Type(...). A constant that merely looks
+            # like one still falls back to the expression parse below.
+            if value == '(':
+                tokens.push_marker()
+                try:
+                    potential_record_type = self.parse_type()
+                    components = self.parse_record_pattern_components(potential_record_type)
+                    tokens.pop_marker(False) # Commit
+                    return tree.RecordPattern(type=potential_record_type,
+                                              components=components,
+                                              _position=token_pos_ref.position)
+                except JavaSyntaxError:
+                    tokens.pop_marker(True) # Rollback
 
             # Check for Type Pattern: Type identifier
-            if isinstance(self.tokens.look(0), Identifier) and \
-               not self.tokens.look(1).value in ['.', '(', '[']:
+            elif (self.look_kind(i) == _IDENTIFIER_KIND
+                  and not self.look_value(i + 1) in _QUALIFIED_TAIL):
+                pattern_type = self.parse_type()
                 pattern_variable_name = self.parse_identifier()
-                self.tokens.pop_marker(accept=True) # Commit
-                return tree.FormalParameter(type=potential_record_type,
+                return tree.FormalParameter(type=pattern_type,
                                              name=pattern_variable_name,
-                                             modifiers=set(),
-                                             annotations=[],
+                                             modifiers=_EMPTY_MODIFIERS,
+                                             annotations=_EMPTY_ANNOTATIONS,
                                              varargs=False,
                                              _position=token_pos_ref.position)
 
-            # If not a record or type pattern starting with this Type, rollback
-            self.tokens.pop_marker(accept=False)
-        except JavaSyntaxError:
-            self.tokens.pop_marker(accept=False) # Rollback on any parsing error for Type or Identifier
-
         # Fallback: Parse as an expression (constant or qualified enum)
         return self.parse_expression()
 
-    @parse_debug
-    def parse_switch_rule(self): # For Switch Expressions
-        - 'null'
-        - A type pattern (Type identifier)
-        - An expression (constant)
-        Returns an AST node representing the label (Literal for null, FormalParameter for type pattern, Expression for constants).
-        """
-        token_pos_ref = self.tokens.look()
-
-        if self.would_accept('null'):
-            # Check if 'null' is followed by an identifier, which would make it a type pattern 'null ident'.
-            # This is not standard for Java 17-21 'case null'. 'case null, default' is allowed.
-            # 'case null:' or 'case null ->'
-            # If 'null' is part of a pattern like 'NullType nullIdentifier', that's different.
-            # For 'case null:', 'null' acts like a special constant.
-            if not isinstance(self.tokens.look(1), Identifier): # Simple 'null' case label
-                self.accept('null')
-                return tree.Literal(value='null', _position=token_pos_ref.position)
-            # If 'null' is followed by an identifier, it might be 'null' as a type name (not standard)
-            # or an expression starting with 'null'. Let expression parser handle it.
-
-        # Try parsing as Type Pattern: Type identifier
-        self.tokens.push_marker()
-        try:
-            # Attempt to parse a type
-            parsed_type = self.parse_type()
-
-            # Check if next is an identifier (and not part of a more complex expression)
-            if isinstance(self.tokens.look(0), Identifier) and \
-               not self.tokens.look(1).value in ['.', '(', '[']: # Heuristic: not start of qualified name, method, array
-                pattern_variable_name = self.parse_identifier()
-                self.tokens.pop_marker(accept=True) # Commit
-                # Modifiers/annotations on pattern variables in case labels are not standard
-                return tree.FormalParameter(type=parsed_type,
-                                             name=pattern_variable_name,
-                                             modifiers=set(),
-                                             annotations=[],
-                                             varargs=False, # Patterns are not varargs
-                                             _position=token_pos_ref.position)
-            else: # Not a pattern of form "Type var"
-                self.tokens.pop_marker(accept=False) # Rollback
-        except JavaSyntaxError: # Failed to parse as Type or subsequent identifier
-            self.tokens.pop_marker(accept=False) # Rollback
-
-        # Fallback: Parse as an expression (constant expression or qualified enum constant)
-        return self.parse_expression()
-
     @parse_debug
     def parse_switch_rule(self): # For Switch Expressions
         labels = []
         guard = None
+        try_accept = self.try_accept
 
-        token = self.tokens.look()
-        if self.try_accept('default'):
+        token = next(self.tokens)
+        if token.value == 'default':
             labels.append(tree.Literal(value="'default'", _position=token.position)) # Represent default
-        elif self.try_accept('case'):
+        elif token.value == 'case':
+            parse_case_label = self.parse_case_label
             while True:
-                labels.append(self.parse_case_label())
-                if not self.try_accept(','):
+                labels.append(parse_case_label())
+                if not try_accept(','):
                     break
         else:
-            self.illegal("Expected 'case' or 'default' in switch rule")
+            self.illegal("Expected 'case' or 'default' in switch rule", at=token)
 
         if self.try_accept('when'):
             guard = self.parse_expression()
@@ -2064,9 +2361,15 @@ class Parser(object):
     def parse_resource(self):
         modifiers, annotations = self.parse_variable_modifiers()
         reference_type = self.parse_reference_type()
-        reference_type.dimensions = self.parse_array_dimension()
+        dimensions = self.parse_array_dimension()
         name = self.parse_identifier()
-        reference_type.dimensions += self.parse_array_dimension()
+
+        # Dimensions after the name are rare, only look for them on a '['
+        if self.look_value() == '[':
+            dimensions = _extend_dimensions(dimensions,
+                                            self.parse_array_dimension())
+
+        reference_type.dimensions = dimensions
         self.accept('=')
         value = self.parse_expression()
 
@@ -2082,9 +2385,11 @@ class Parser(object):
     @parse_debug
     def parse_switch_block_statement_groups(self):
         statement_groups = list()
+        look_value = self.look_value
+        parse_switch_block_statement_group = self.parse_switch_block_statement_group
 
-        while self.tokens.look().value in ('case', 'default'):
-            statement_group = self.parse_switch_block_statement_group()
+        while look_value() in _SWITCH_LABELS:
+            statement_group = parse_switch_block_statement_group()
             statement_groups.append(statement_group)
 
         return statement_groups
@@ -2094,23 +2399,27 @@ class Parser(object):
         case_labels = [] # Renamed from 'labels' to avoid confusion with SwitchRule's labels
         guard = None
         statements = list()
+        has_default = False
 
         # This outer loop handles multiple 'case X:' clauses falling through
-        while self.tokens.look().value in ('case', 'default'):
-            current_label_token = self.tokens.look()
-            if self.try_accept('default'):
+        while self.look_value() in _SWITCH_LABELS:
+            # The loop condition guarantees 'case' or 'default' here
+            current_label_token = next(self.tokens)
+            if current_label_token.value == 'default':
                 # Ensure only one default and it's the only label for this group if present
-                if any(isinstance(cl, tree.Literal) and cl.value == "'default'" for cl in case_labels):
+                if has_default:
                     self.illegal("Multiple default labels or default with other case labels.")
+                has_default = True
                 case_labels.append(tree.Literal(value="'default'", _position=current_label_token.position))
-            elif self.try_accept('case'):
+            else:
+                append = case_labels.append
+                parse_case_label = self.parse_case_label
+                try_accept = self.try_accept
+
                 while True:
-                    case_labels.append(self.parse_case_label())
-                    if not self.try_accept(','):
+                    append(parse_case_label())
+                    if not try_accept(','):
                         break
-            else:
-                # Should not happen due to outer loop condition, but as safeguard:
-                self.illegal("Expected 'case' or 'default'")
 
             # Check for a guard clause for the current set of case labels
             # A guard applies to all case patterns sharing that colon.
@@ -2132,40 +2441,44 @@ class Parser(object):
 
             # If the next token is still 'case' or 'default', these labels fall through to the same block.
             # The guard, if present, applies to all labels that fall into this block.
-            if self.tokens.look().value not in ('case', 'default'):
+            if self.look_value() not in _SWITCH_LABELS:
                 break # End of label declarations for this group
 
         # Parse statements for this group
-        while self.tokens.look().value not in ('case', 'default', '}'):
-            statement = self.parse_block_statement()
+        look_value = self.look_value
+        parse_block_statement = self.parse_block_statement
+        while look_value() not in _SWITCH_GROUP_END:
+            statement = parse_block_statement()
             statements.append(statement)
 
         return tree.SwitchStatementCase(case=case_labels, guard=guard, statements=statements)
 
     @parse_debug
     def parse_for_control(self):
-        # Try for_var_control and fall back to normal three part for control
+        # Decide between a for_var_control and the normal three part for
+        # control from the tokens ahead
+        value = self.look_value()
+        if (value == 'final' or value == 'var'
+                or self.look_kind() == _ANNOTATION_KIND
+                or self.is_local_variable_declaration(_FOR_DECLARATOR_FOLLOWERS)):
+            return self.parse_for_var_control()
 
-        try:
-            with self.tokens:
-                return self.parse_for_var_control()
-        except JavaSyntaxError:
-            pass
+        look_value = self.look_value
 
         init = None
-        if not self.would_accept(';'):
+        if look_value() != ';':
             init = self.parse_for_init_or_update()
 
         self.accept(';')
 
         condition = None
-        if not self.would_accept(';'):
+        if look_value() != ';':
             condition = self.parse_expression()
 
         self.accept(';')
 
         update = None
-        if not self.would_accept(')'):
+        if look_value() != ')':
             update = self.parse_for_init_or_update()
 
         return tree.ForControl(init=init,
@@ -2176,7 +2489,7 @@ class Parser(object):
     def parse_for_var_control(self):
         modifiers, annotations = self.parse_variable_modifiers()
 
-        if self.tokens.look().value == 'var':
+        if self.look_value() == 'var':
             next(self.tokens) # Consume 'var'
             var_type = tree.ReferenceType(name='var', dimensions=[])
         else:
@@ -2185,7 +2498,8 @@ class Parser(object):
         var_name = self.parse_identifier()
         # For 'var', dimensions are handled by declarator, not directly on type
         if var_type.name != 'var':
-            var_type.dimensions += self.parse_array_dimension()
+            var_type.dimensions = _extend_dimensions(
+                var_type.dimensions, self.parse_array_dimension())
 
         var = tree.VariableDeclaration(modifiers=modifiers,
                                        annotations=annotations,
@@ -2211,20 +2525,22 @@ class Parser(object):
             expression = self.parse_expression()
             return expression
 
+        look_value = self.look_value
+
         declarators = None
-        if not self.would_accept(';'):
+        if look_value() != ';':
             declarators = self.parse_for_variable_declarator_rest()
         else:
             declarators = [tree.VariableDeclarator()]
         self.accept(';')
 
         condition = None
-        if not self.would_accept(';'):
+        if look_value() != ';':
             condition = self.parse_expression()
         self.accept(';')
 
         update = None
-        if not self.would_accept(')'):
+        if look_value() != ')':
             update = self.parse_for_init_or_update()
 
         return (declarators, condition, update)
@@ -2237,22 +2553,25 @@ class Parser(object):
             initializer = self.parse_variable_initializer()
 
         declarators = [tree.VariableDeclarator(initializer=initializer)]
+        try_accept = self.try_accept
+        parse_variable_declarator = self.parse_variable_declarator
 
-        while self.try_accept(','):
-            declarator = self.parse_variable_declarator()
-            declarators.append(declarator)
+        while try_accept(','):
+            declarators.append(parse_variable_declarator())
 
         return declarators
 
     @parse_debug
     def parse_for_init_or_update(self):
         expressions = list()
+        append = expressions.append
+        parse_expression = self.parse_expression
+        try_accept = self.try_accept
 
         while True:
-            expression = self.parse_expression()
-            expressions.append(expression)
+            append(parse_expression())
 
-            if not self.try_accept(','):
+            if not try_accept(','):
                 break
 
         return expressions
@@ -2263,147 +2582,173 @@ class Parser(object):
     @parse_debug
     def parse_expression(self):
         expressionl = self.parse_expressionl()
-        assignment_type = None
-        assignment_expression = None
-
-        if self.tokens.look().value in Operator.ASSIGNMENT:
-            assignment_type = self.tokens.next().value
-            assignment_expression = self.parse_expression()
-            return tree.Assignment(expressionl=expressionl,
-                                   type=assignment_type,
-                                   value=assignment_expression)
-        else:
+
+        if self.look_value() not in Operator.ASSIGNMENT:
             return expressionl
 
+        # Assignments associate to the right; collect the chain and fold it
+        # from the end rather than recursing once per '='
+        targets = list()
+        while self.look_value() in Operator.ASSIGNMENT:
+            targets.append((expressionl, next(self.tokens).value))
+            expressionl = self.parse_expressionl()
+
+        for target, assignment_type in reversed(targets):
+            expressionl = tree.Assignment(expressionl=target,
+                                          type=assignment_type,
+                                          value=expressionl)
+
+        return expressionl
+
     @parse_debug
     def parse_expressionl(self):
         expression_2 = self.parse_expression_2()
-        true_expression = None
-        false_expression = None
-
-        if self.try_accept('?'):
-            true_expression = self.parse_expression()
-            self.accept(':')
-            false_expression = self.parse_expressionl()
-
-            return tree.TernaryExpression(condition=expression_2,
-                                          if_true=true_expression,
-                                          if_false=false_expression)
-        if self.would_accept('->'):
+        branches = None
+
+        if self.look_value() == '?':
+            # Conditionals nest in their false branch; collect the chain and
+            # fold it from the end rather than recursing once per '?'
+            branches = list()
+            while self.try_accept('?'):
+                true_expression = self.parse_expression()
+                self.accept(':')
+                branches.append((expression_2, true_expression))
+                expression_2 = self.parse_expression_2()
+
+        value = self.look_value()
+        if value == '->':
             body = self.parse_lambda_method_body()
-            return tree.LambdaExpression(parameters=[expression_2],
-                                         body=body)
-        if self.try_accept('::'):
+            expression_2 = tree.LambdaExpression(parameters=[expression_2],
+                                                 body=body)
+        elif value == '::':
+            next(self.tokens)
             method_reference, type_arguments = self.parse_method_reference()
-            return tree.MethodReference(
+            expression_2 = tree.MethodReference(
                 expression=expression_2,
                 method=method_reference,
                 type_arguments=type_arguments)
+
+        if branches:
+            for condition, true_expression in reversed(branches):
+                expression_2 = tree.TernaryExpression(condition=condition,
+                                                      if_true=true_expression,
+                                                      if_false=expression_2)
+
         return expression_2
 
     @parse_debug
     def parse_expression_2(self):
         expression_3 = self.parse_expression_3()
-        token = self.tokens.look()
-        if token.value in Operator.INFIX or token.value == 'instanceof':
-            parts = self.parse_expression_2_rest()
-            parts.insert(0, expression_3)
-            return self.build_binary_operation(parts)
+        if self.look_value() in _INFIX_OR_INSTANCEOF:
+            return self.parse_expression_2_rest(expression_3)
 
         return expression_3
 
     @parse_debug
-    def parse_expression_2_rest(self):
-        parts = list()
+    def parse_expression_2_rest(self, operand):
+        # Operators still waiting for their right operand, kept with
+        # increasing binding strength. An incoming operator first folds every
+        # pending one that binds at least as tightly, which makes equal
+        # levels associate to the left.
+        operands = [operand]
+        operators = list()
+        operator_levels = self.operator_levels
+        build_binary_operation = self.build_binary_operation
+        look_value = self.look_value
+        parse_infix_operator = self.parse_infix_operator
+        parse_expression_3 = self.parse_expression_3
 
-        token = self.tokens.look()
-        while token.value in Operator.INFIX or token.value == 'instanceof':
+        while look_value() in _INFIX_OR_INSTANCEOF:
             if self.try_accept('instanceof'):
-                # After 'instanceof', we expect a Type, which could be start of a pattern.
-                self.tokens.push_marker()
-                try:
-                    instanceof_type = self.parse_type() # This is the type in 'instanceof Type ...'
-
-                    # Check for Record Pattern: Type(...)
-                    if self.would_accept('('):
-                        components = self.parse_record_pattern_components(instanceof_type)
-                        record_pattern = tree.RecordPattern(type=instanceof_type, components=components)
-                        parts.extend((('instanceof_pattern', record_pattern), None))
-                        self.tokens.pop_marker(accept=True)
-                    # Check for Type Pattern: Type identifier
-                    elif isinstance(self.tokens.look(0), Identifier) and \
-                         not self.tokens.look(1).value in ['.', '(', '[']:
-                        pattern_name = self.parse_identifier()
-                        type_pattern_as_param = tree.FormalParameter(type=instanceof_type, name=pattern_name, modifiers=set(), annotations=[])
-                        parts.extend((('instanceof_pattern', type_pattern_as_param), None))
-                        self.tokens.pop_marker(accept=True)
-                    else: # Legacy instanceof Type
-                        self.tokens.pop_marker(accept=False) # Rollback type, then re-parse as part of expression_3 if needed, or just use it
-                        # This path means it's 'instanceof Type' where Type is the operandr.
-                        # The comparison_type here IS the operandr for build_binary_operation.
-                        parts.extend((('instanceof_type', instanceof_type), None)) # operandr is None here, type is passed in tuple
-                                                                                # This needs build_binary_operation to handle it.
-                                                                                # Or, ensure operandr is instanceof_type.
-                                                                                # Let's try: parts.extend(('instanceof_type', instanceof_type))
-                                                                                # then build_binary_operation needs to handle the 'None' operandr.
-
-                except JavaSyntaxError: # Failed to parse Type after instanceof
-                    self.tokens.pop_marker(accept=False)
-                    self.illegal("Type expected after 'instanceof'")
+                operator = 'instanceof'
+                # The type may be followed by a record pattern's components or
+                # a pattern variable; the next tokens tell which, so nothing
+                # needs to be parsed speculatively
+                instanceof_type = self.parse_type()
+
+                if look_value() == '(':
+                    components = self.parse_record_pattern_components(instanceof_type)
+                    operand = tree.RecordPattern(type=instanceof_type,
+                                                 components=components)
+                elif (self.look_kind() == _IDENTIFIER_KIND
+                      and not look_value(1) in _QUALIFIED_TAIL):
+                    pattern_name = self.parse_identifier()
+                    operand = tree.FormalParameter(type=instanceof_type,
+                                                   name=pattern_name,
+                                                   modifiers=_EMPTY_MODIFIERS,
+                                                   annotations=_EMPTY_ANNOTATIONS)
+                else: # Legacy instanceof Type
+                    operand = instanceof_type
             else: # Not 'instanceof', regular infix operator
-                operator = self.parse_infix_operator()
-                expression = self.parse_expression_3()
-                parts.extend((operator, expression))
+                operator = parse_infix_operator()
+                operand = parse_expression_3()
 
-            token = self.tokens.look()
+            level = operator_levels[operator]
+            while operators and operator_levels[operators[-1]] >= level:
+                operandr = operands.pop()
+                operands[-1] = build_binary_operation(operands[-1], operators.pop(), operandr)
 
-        return parts
+            operators.append(operator)
+            operands.append(operand)
+
+        while operators:
+            operandr = operands.pop()
+            operands[-1] = build_binary_operation(operands[-1], operators.pop(), operandr)
+
+        return operands[0]
 
 # ------------------------------------------------------------------------------
 # -- Expression operators --
 
     @parse_debug
     def parse_expression_3(self):
-        prefix_operators = list()
-        while self.tokens.look().value in Operator.PREFIX:
-            prefix_operators.append(self.tokens.next().value)
-
-        if self.would_accept('('):
-            try:
-                with self.tokens:
-                        lambda_exp = self.parse_lambda_expression()
-                        if lambda_exp:
-                            return lambda_exp
-            except JavaSyntaxError:
-                pass
-            try:
-                with self.tokens:
-                    self.accept('(')
-                    cast_target = self.parse_type()
-                    self.accept(')')
-                    expression = self.parse_expression_3()
+        tokens = self.tokens
+        look = tokens.look
+        look_value = self.look_value
+
+        prefix_operators = _EMPTY_OPERATORS
+        if look_value() in Operator.PREFIX:
+            prefix_operators = list()
+            while look_value() in Operator.PREFIX:
+                prefix_operators.append(next(tokens).value)
+
+        if look_value() == '(':
+            # A lambda's parameter list is followed by '->', a cast holds only
+            # a type; anything else is a parenthesized expression. A lambda
+            # with a single untyped parameter, '(x) -> ...', is built by
+            # parse_expressionl from the parenthesized expression.
+            if (self.look_value(self.skip_parentheses()) == '->'
+                    and self.is_lambda_parameters()):
+                return self.parse_lambda_expression()
+
+            if self.is_cast():
+                self.accept('(')
+                cast_target = self.parse_type()
+                self.accept(')')
+                expression = self.parse_expression_3()
 
-                    return tree.Cast(type=cast_target,
-                                     expression=expression)
-            except JavaSyntaxError:
-                pass
+                return tree.Cast(type=cast_target,
+                                 expression=expression)
 
         primary = self.parse_primary()
         primary.prefix_operators = prefix_operators
-        # Ensure selectors and postfix_operators are initialized for the primary node
-        if not hasattr(primary, 'selectors') or primary.selectors is None:
-            primary.selectors = list()
-        if not hasattr(primary, 'postfix_operators') or primary.postfix_operators is None:
-            primary.postfix_operators = list()
+        # Ensure selectors are initialized for the primary node. Most
+        # primaries have none and share an empty tuple; a parenthesized
+        # primary may already carry one from the inner expression.
+        if look_value() in _SELECTOR_STARTS:
+            if not getattr(primary, 'selectors', None):
+                primary.selectors = list()
+            append_selector = primary.selectors.append
+        elif getattr(primary, 'selectors', None) is None:
+            primary.selectors = _EMPTY_SELECTORS
 
         # Loop for selectors (member access, array index, method invocation) OR String Templates
-        while True:
-            token = self.tokens.look()
-
-            if token.value == '.':
+        parse_selector = self.parse_selector
+        while look_value() in _SELECTOR_STARTS:
+            if look_value() == '.':
                 # Potential member access or string template
-                if isinstance(self.tokens.look(1), Literal):
-                    literal_peek = self.tokens.look(1)
+                if self.look_kind(1) == _LITERAL_KIND:
+                    literal_peek = look(1)
                     if literal_peek.value.startswith('"') or literal_peek.value.startswith('"""'):
                         # This is a String Template
                         self.accept('.') # Consume dot
@@ -2413,29 +2758,25 @@ class Parser(object):
 
                 # If not a string template, it's a standard selector starting with '.'
                 # Let parse_selector handle .identifier, .this, .super(), .new, etc.
-                selector = self.parse_selector() # parse_selector itself consumes the dot
-                primary.selectors.append(selector)
+                append_selector(parse_selector()) # parse_selector itself consumes the dot
 
-            elif token.value == '[':
+            else:
                 # Array selector
-                selector = self.parse_selector() # parse_selector consumes the '[' and ']'
-                primary.selectors.append(selector)
+                append_selector(parse_selector()) # parse_selector consumes the '[' and ']'
 
             # NOTE: Method invocations like primary(...) are handled by parse_identifier_suffix
             # when primary itself is just an identifier, or by parse_selector if primary is already complex.
             # String templates like processor."..." are now handled above.
 
-            else: # Not a selector that starts with . or [ that this loop handles
-                break
-
-            token = self.tokens.look() # Update for next iteration
-
         # Postfix operators like ++, --
         # This loop should be separate and after the selector/template loop
-        token = self.tokens.look() # Re-fetch token, as it might have changed if selector loop broke early
-        while token.value in Operator.POSTFIX:
-            primary.postfix_operators.append(self.tokens.next().value)
-            token = self.tokens.look()
+        postfix = Operator.POSTFIX
+        postfix_operators = getattr(primary, 'postfix_operators', None) or _EMPTY_OPERATORS
+        if look_value() in postfix:
+            postfix_operators = list(postfix_operators)
+            while look_value() in postfix:
+                postfix_operators.append(next(tokens).value)
+        primary.postfix_operators = postfix_operators
 
         return primary
 
@@ -2497,8 +2838,37 @@ class Parser(object):
     @parse_debug
     def parse_primary(self):
         token = self.tokens.look()
+        kind = self.look_kind()
+
+        if kind == _IDENTIFIER_KIND:
+            # The last identifier is kept apart from the dotted prefix, as
+            # most suffixes take it as their member
+            qualifier = ''
+            identifier = self.parse_identifier()
+
+            while self.look_value() == '.' and self.look_kind(1) == _IDENTIFIER_KIND:
+                next(self.tokens)
+                qualifier = qualifier + '.' + identifier if qualifier else identifier
+                identifier = self.parse_identifier()
+
+            identifier_suffix = self.parse_identifier_suffix()
+
+            if isinstance(identifier_suffix, (tree.MemberReference, tree.MethodInvocation)):
+                # Take the last identifer as the member and leave the rest for the qualifier
+                identifier_suffix.member = identifier
+
+            elif isinstance(identifier_suffix, tree.ClassReference):
+                identifier_suffix.type = tree.ReferenceType(name=identifier)
+
+            else:
+                qualifier = qualifier + '.' + identifier if qualifier else identifier
+
+            identifier_suffix._position = token.position
+            identifier_suffix.qualifier = qualifier
+
+            return identifier_suffix
 
-        if isinstance(token, Literal):
+        elif kind == _LITERAL_KIND:
             literal = self.parse_literal()
             literal._position = token.position
             return literal
@@ -2506,75 +2876,78 @@ class Parser(object):
         elif token.value == '(':
             return self.parse_par_expression()
 
-        elif self.try_accept('this'):
-            arguments = None
-
-            if self.would_accept('('):
-                arguments = self.parse_arguments()
-                return tree.ExplicitConstructorInvocation(arguments=arguments)
-
-            return tree.This()
-        elif self.would_accept('super', '::'):
-            self.accept('super')
-            return token
-        elif self.try_accept('super'):
-            super_suffix = self.parse_super_suffix()
-            return super_suffix
+        # Keyword-led primaries are dispatched on the keyword with a single
+        # lookup; unlike statement handlers, these consume it themselves
+        handler = self.primary_parsers.get(token.value)
+        if handler is not None:
+            return handler(self, token)
 
-        elif self.try_accept('new'):
-            return self.parse_creator()
+        if kind == _BASIC_TYPE_KIND:
+            base_type = self.parse_basic_type()
+            base_type.dimensions = self.parse_array_dimension()
+            self.accept('.', 'class')
 
-        elif token.value == '<':
-            type_arguments = self.parse_nonwildcard_type_arguments()
+            return tree.ClassReference(type=base_type)
 
-            if self.try_accept('this'):
-                arguments = self.parse_arguments()
-                return tree.ExplicitConstructorInvocation(type_arguments=type_arguments,
-                                                          arguments=arguments)
-            else:
-                invocation = self.parse_explicit_generic_invocation_suffix()
-                invocation._position = token.position
-                invocation.type_arguments = type_arguments
+        self.illegal("Expected expression")
 
-                return invocation
+    @parse_debug
+    def parse_this_primary(self, token):
+        next(self.tokens)
 
-        elif isinstance(token, Identifier):
-            qualified_identifier = [self.parse_identifier()]
+        if self.look_value() == '(':
+            arguments = self.parse_arguments()
+            return tree.ExplicitConstructorInvocation(arguments=arguments)
 
-            while self.would_accept('.', Identifier):
-                self.accept('.')
-                identifier = self.parse_identifier()
-                qualified_identifier.append(identifier)
+        return tree.This()
 
-            identifier_suffix = self.parse_identifier_suffix()
+    @parse_debug
+    def parse_super_primary(self, token):
+        next(self.tokens)
 
-            if isinstance(identifier_suffix, (tree.MemberReference, tree.MethodInvocation)):
-                # Take the last identifer as the member and leave the rest for the qualifier
-                identifier_suffix.member = qualified_identifier.pop()
+        if self.look_value() == '::':
+            return token
 
-            elif isinstance(identifier_suffix, tree.ClassReference):
-                identifier_suffix.type = tree.ReferenceType(name=qualified_identifier.pop())
+        return self.parse_super_suffix()
 
-            identifier_suffix._position = token.position
-            identifier_suffix.qualifier = '.'.join(qualified_identifier)
+    @parse_debug
+    def parse_new_primary(self, token):
+        next(self.tokens)
+        return self.parse_creator()
 
-            return identifier_suffix
+    @parse_debug
+    def parse_generic_primary(self, token):
+        type_arguments = self.parse_nonwildcard_type_arguments()
 
-        elif isinstance(token, BasicType):
-            base_type = self.parse_basic_type()
-            base_type.dimensions = self.parse_array_dimension()
-            self.accept('.', 'class')
+        if self.try_accept('this'):
+            arguments = self.parse_arguments()
+            return tree.ExplicitConstructorInvocation(type_arguments=type_arguments,
+                                                      arguments=arguments)
+        else:
+            invocation = self.parse_explicit_generic_invocation_suffix()
+            invocation._position = token.position
+            invocation.type_arguments = type_arguments
 
-            return tree.ClassReference(type=base_type)
+            return invocation
 
-        elif self.try_accept('void'):
-            self.accept('.', 'class')
-            return tree.VoidClassReference()
+    @parse_debug
+    def parse_void_primary(self, token):
+        next(self.tokens)
+        self.accept('.', 'class')
+        return tree.VoidClassReference()
 
-        elif token.value == 'switch':
-           return self.parse_switch_expression()
+    @parse_debug
+    def parse_switch_primary(self, token):
+        return self.parse_switch_expression()
 
-        self.illegal("Expected expression")
+    primary_parsers = {
+        'this': parse_this_primary,
+        'super': parse_super_primary,
+        'new': parse_new_primary,
+        '<': parse_generic_primary,
+        'void': parse_void_primary,
+        'switch': parse_switch_primary,
+    }
 
     @parse_debug
     def parse_literal(self):
@@ -2591,18 +2964,20 @@ class Parser(object):
 
     @parse_debug
     def parse_arguments(self):
-        expressions = list()
-
         self.accept('(')
 
         if self.try_accept(')'):
-            return expressions
+            return _EMPTY_ARGUMENTS
+
+        expressions = list()
+        append = expressions.append
+        parse_expression = self.parse_expression
+        try_accept = self.try_accept
 
         while True:
-            expression = self.parse_expression()
-            expressions.append(expression)
+            append(parse_expression())
 
-            if not self.try_accept(','):
+            if not try_accept(','):
                 break
 
         self.accept(')')
@@ -2654,7 +3029,7 @@ class Parser(object):
     def parse_creator(self):
         constructor_type_arguments = None
 
-        if self.would_accept(BasicType):
+        if self.look_kind() == _BASIC_TYPE_KIND:
             created_name = self.parse_basic_type()
             rest = self.parse_array_creator_rest()
             rest.type = created_name
@@ -2732,7 +3107,8 @@ class Parser(object):
     @parse_debug
     def parse_identifier_suffix(self):
         if self.try_accept('[', ']'):
-            array_dimension = [None] + self.parse_array_dimension()
+            array_dimension = [None]
+            array_dimension += self.parse_array_dimension()
             self.accept('.', 'class')
             return tree.ClassReference(type=tree.Type(dimensions=array_dimension))
 
@@ -2800,38 +3176,48 @@ class Parser(object):
 
     @parse_debug
     def parse_selector(self):
-        if self.try_accept('['):
+        tokens = self.tokens
+        value = self.look_value()
+
+        if value == '[':
+            next(tokens)
             expression = self.parse_expression()
             self.accept(']')
             return tree.ArraySelector(index=expression)
 
-        elif self.try_accept('.'):
+        elif value == '.':
+            next(tokens)
 
-            token = self.tokens.look()
-            if isinstance(token, Identifier):
-                identifier = self.tokens.next().value
-                arguments = None
+            # Dispatch on the token after the dot, read once
+            token = tokens.look()
+            value = token.value
+
+            if self.look_kind() == _IDENTIFIER_KIND:
+                identifier = next(tokens).value
 
-                if self.would_accept('('):
+                if self.look_value() == '(':
                     arguments = self.parse_arguments()
 
                     return tree.MethodInvocation(member=identifier,
                                                  arguments=arguments)
                 else:
                     return tree.MemberReference(member=identifier)
-            elif self.would_accept('super', '::'):
-                self.accept('super')
+            elif value == 'super' and self.look_value(1) == '::':
+                next(tokens)
                 return token
-            elif self.would_accept('<'):
+            elif value == '<':
                 return self.parse_explicit_generic_invocation()
-            elif self.try_accept('this'):
+            elif value == 'this':
+                next(tokens)
                 return tree.This()
-            elif self.try_accept('super'):
+            elif value == 'super':
+                next(tokens)
                 return self.parse_super_suffix()
-            elif self.try_accept('new'):
+            elif value == 'new':
+                next(tokens)
                 type_arguments = None
 
-                if self.would_accept('<'):
+                if self.look_value() == '<':
                     type_arguments = self.parse_nonwildcard_type_arguments()
 
                 inner_creator = self.parse_inner_creator()
@@ -2871,7 +3257,7 @@ class Parser(object):
             content = raw_content_with_quotes[1:-1]
         else:
             # Not a valid string literal token value format this method expects
-            self.illegal(f"Invalid string literal format for unescaping: {raw_content_with_quotes}")
+            self.illegal(("Invalid string literal format for unescaping: %s", raw_content_with_quotes))
             return ""
 
         # Simplified unescaping for standard Java escapes.
@@ -2961,7 +3347,7 @@ class Parser(object):
                         from .tokenizer import tokenize as template_tokenize # Local import
                         expr_tokens = list(template_tokenize(expression_string))
                         if not expr_tokens:
-                             self.illegal(f"Cannot parse empty embedded expression: '{expression_string}'", at=template_literal_token)
+                             self.illegal(("Cannot parse empty embedded expression: '%s'", expression_string), at=template_literal_token)
 
                         expr_parser = Parser(iter(expr_tokens))
                         parsed_expression = expr_parser.parse_expression()
@@ -3061,10 +3447,12 @@ class Parser(object):
     @parse_debug
     def parse_annotation_type_element_declarations(self):
         declarations = list()
+        append = declarations.append
+        look_value = self.look_value
+        parse_declaration = self.parse_annotation_type_element_declaration
 
-        while not self.would_accept('}'):
-            declaration = self.parse_annotation_type_element_declaration()
-            declarations.append(declaration)
+        while look_value() != '}':
+            append(parse_declaration())
 
         return declarations
 
@@ -3074,27 +3462,21 @@ class Parser(object):
         declaration = None
 
         token = self.tokens.look()
-        if self.would_accept('class'):
-            declaration = self.parse_normal_class_declaration()
-        elif self.would_accept('interface'):
-            declaration = self.parse_normal_interface_declaration()
-        elif self.would_accept('enum'):
-            declaration = self.parse_enum_declaration()
-        elif self.is_annotation_declaration():
+        handler = self.annotation_member_parsers.get(token.value)
+
+        if handler is not None:
+            declaration = handler(self)
+        elif type(token) is Annotation and self.look_value(1) == 'interface':
+            # is_annotation_declaration() on the token already in hand; most
+            # members are methods and fail the class test straight away
             declaration = self.parse_annotation_type_declaration()
         else:
             attribute_type = self.parse_type()
             attribute_name = self.parse_identifier()
-            declaration = self.parse_annotation_method_or_constant_rest()
+            declaration = self.parse_annotation_method_or_constant_rest(attribute_type,
+                                                                        attribute_name)
             self.accept(';')
 
-            if isinstance(declaration, tree.AnnotationMethod):
-                declaration.name = attribute_name
-                declaration.return_type = attribute_type
-            else:
-                declaration.declarators[0].name = attribute_name
-                declaration.type = attribute_type
-
         declaration._position = token.position
         declaration.modifiers = modifiers
         declaration.annotations = annotations
@@ -3103,7 +3485,7 @@ class Parser(object):
         return declaration
 
     @parse_debug
-    def parse_annotation_method_or_constant_rest(self):
+    def parse_annotation_method_or_constant_rest(self, attribute_type, attribute_name):
         if self.try_accept('('):
             self.accept(')')
 
@@ -3113,10 +3495,22 @@ class Parser(object):
             if self.try_accept('default'):
                 default = self.parse_element_value()
 
-            return tree.AnnotationMethod(dimensions=array_dimension,
+            return tree.AnnotationMethod(name=attribute_name,
+                                         return_type=attribute_type,
+                                         dimensions=array_dimension,
                                          default=default)
         else:
-            return self.parse_constant_declarators_rest()
+            constant = self.parse_constant_declarators_rest()
+            constant.declarators[0].name = attribute_name
+            constant.type = attribute_type
+
+            return constant
+
+    annotation_member_parsers = {
+        'class': parse_normal_class_declaration,
+        'interface': parse_normal_interface_declaration,
+        'enum': parse_enum_declaration,
+    }
 
 def parse(tokens, debug=False):
     parser = Parser(tokens)
@@ -0,0 +1,34 @@
+import unittest
+
+from .. import parse, tree
+
+
+def field_types(source):
+    compilation_unit = parse.parse(source)
+    return [field.type for _, field in compilation_unit.filter(tree.FieldDeclaration)]
+
+
+class ArrayDimensionsTest(unittest.TestCase):
+
+    def test_dimensions_are_lists(self):
+        int_type, matrix_type = field_types('class A { int[] g; int[][] h; }')
+
+        self.assertEqual(int_type.dimensions, [None])
+        self.assertEqual(matrix_type.dimensions, [None, None])
+
+    def test_no_dimensions(self):
+        string_type, = field_types('class A { String s; }')
+
+        self.assertFalse(string_type.dimensions)
+
+    def test_dimensions_after_declarator(self):
+        compilation_unit = parse.parse(
+            'class A { int m(int p[])[] { return null; } }')
+        method = next(compilation_unit.filter(tree.MethodDeclaration))[1]
+
+        self.assertEqual(method.return_type.dimensions, [None])
+        self.assertEqual(method.parameters[0].type.dimensions, [None])
+
+
+if __name__ == "__main__":
+    unittest.main()
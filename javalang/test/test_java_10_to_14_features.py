@@ -288,6 +288,20 @@ class TestJavaModernFeatures(unittest.TestCase): # Renamed class
         self.assertIsInstance(literal, tree.Literal)
         self.assertEqual(literal.value, expected)
 
+    def test_text_block_octal_and_backslash_escapes(self):
+        code = r'''
+        class Test {
+            String text = """
+                          \0a\400 \\
+                          end""";
+        }
+        '''
+        # \0 stops at the non-octal 'a', \400 is \40 followed by '0', and an
+        # escaped backslash before the newline is not a line continuation.
+        cu = javalang.parse.parse(code)
+        literal = next(node for _, node in cu.filter(tree.Literal))
+        self.assertEqual(literal.value, '\n\x00a 0 \\\nend')
+
 
     def test_record_declaration_simple(self):
         code = """
@@ -401,6 +415,44 @@ class TestJavaModernFeatures(unittest.TestCase): # Renamed class
         self.assertIsInstance(bin_op.operandr, tree.ReferenceType)
         self.assertEqual(bin_op.operandr.name, "String")
 
+    def test_instanceof_record_pattern(self):
+        code = """
+        class Test {
+            boolean method(Object obj) {
+                return obj instanceof Point(int x, int y) && x == y;
+            }
+        }
+        """
+        cu = javalang.parse.parse(code)
+        return_stmt = next(node for _, node in cu.filter(tree.ReturnStatement))
+
+        self.assertEqual(return_stmt.expression.operator, "&&")
+        instance_of = return_stmt.expression.operandl
+        self.assertIsInstance(instance_of, tree.InstanceOfPatternExpression)
+        self.assertEqual(instance_of.expression.member, "obj")
+        self.assertEqual(instance_of.type.name, "Point")
+        self.assertIsInstance(instance_of.pattern, tree.RecordPattern)
+        self.assertEqual([c.name for c in instance_of.pattern.components], ["x", "y"])
+
+    def test_instanceof_precedence(self):
+        code = """
+        class Test {
+            boolean method(Object obj) {
+                return flag == obj instanceof String && obj instanceof Integer i;
+            }
+        }
+        """
+        cu = javalang.parse.parse(code)
+        return_stmt = next(node for _, node in cu.filter(tree.ReturnStatement))
+
+        conjunction = return_stmt.expression
+        self.assertEqual(conjunction.operator, "&&")
+        self.assertEqual(conjunction.operandl.operator, "==")
+        self.assertEqual(conjunction.operandl.operandr.operator, "instanceof")
+        self.assertEqual(conjunction.operandl.operandr.operandr.name, "String")
+        self.assertIsInstance(conjunction.operandr, tree.InstanceOfPatternExpression)
+        self.assertEqual(conjunction.operandr.pattern.name, "i")
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -81,6 +81,29 @@ class TestTokenizer(unittest.TestCase):
         # Then
         self.assertEqual(len(tokens), 14)
 
+    def test_tokenize_zero_at_end(self):
+        # Given
+        code = "0"
+
+        # When
+        tokens = list(tokenizer.tokenize(code))
+
+        # Then
+        self.assertEqual(len(tokens), 1)
+        self.assertEqual(tokens[0].value, "0")
+        self.assertEqual(type(tokens[0]), tokenizer.DecimalInteger)
+
+    def test_tokenize_long_suffix(self):
+        # Given
+        code = "x = 10L + 0x1_fl + 7"
+
+        # When
+        tokens = list(tokenizer.tokenize(code))
+
+        # Then
+        self.assertEqual([token.value for token in tokens],
+                         ["x", "=", "10L", "+", "0x1_fl", "+", "7"])
+
     def test_tokenize_hex_integer_at_end(self):
         # Given
         code = "nextKey = new BlockKey(serialNo, System.currentTimeMillis() + 0x3"
@@ -188,5 +211,27 @@ int k;
         self.assertEqual(token[0].position.column, 1)
         self.assertEqual(token[3].position.column, 1)
 
+    def test_unicode_escapes(self):
+        # Given
+        code = r'int \uu0061 = 1; String s = "\\u0041";'
+
+        # When
+        tokens = list(tokenizer.tokenize(code))
+
+        # Then
+        self.assertEqual(tokens[1].value, "a")
+        self.assertEqual(tokens[8].value, r'"\\u0041"')
+
+    def test_invalid_unicode_escape_ignore_errors(self):
+        # Given
+        code = r'x \u00zz y'
+
+        # When
+        tokens = list(tokenizer.tokenize(code, ignore_errors=True))
+
+        # Then
+        self.assertEqual(tokens[0].value, "x")
+        self.assertEqual(tokens[-1].value, "y")
+
 if __name__=="__main__":
     unittest.main()
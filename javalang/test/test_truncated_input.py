@@ -0,0 +1,38 @@
+import unittest
+
+from .. import parse, parser
+
+
+class TruncatedInputTest(unittest.TestCase):
+
+    def assert_syntax_error(self, source):
+        with self.assertRaises(parser.JavaSyntaxError):
+            parse.parse(source)
+
+    def test_unclosed_class_declaration(self):
+        self.assert_syntax_error('class A {')
+
+    def test_truncated_declarations(self):
+        for source in ['class', 'package a', 'import a.', 'class T { int',
+                       'enum E { A, B', 'interface I { int m()']:
+            with self.subTest(source=source):
+                self.assert_syntax_error(source)
+
+    def test_truncated_statements(self):
+        for source in ['class T { void m() { if (a',
+                       'class T { void m() { Object o = (String']:
+            with self.subTest(source=source):
+                self.assert_syntax_error(source)
+
+    def test_unclosed_class_body(self):
+        self.assert_syntax_error('class A { void m() { }')
+
+    def test_unclosed_method_block(self):
+        self.assert_syntax_error('class A { void m() {')
+
+    def test_unclosed_interface_body(self):
+        self.assert_syntax_error('interface I { void m();')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from ..util import LookAheadIterator
+from ..util import LookAheadIterator, LookAheadListIterator
 
 
 class TestLookAheadIterator(unittest.TestCase):
@@ -65,5 +65,31 @@ class TestLookAheadIterator(unittest.TestCase):
         self.assertEqual(next(i), 14)
 
 
+class TestLookAheadListIterator(unittest.TestCase):
+    def test_nested_markers(self):
+        i = LookAheadListIterator(list(range(0, 10)))
+
+        i.push_marker() #1
+        self.assertEqual(next(i), 0)
+        i.push_marker() #2
+        self.assertEqual(next(i), 1)
+        i.pop_marker(False) #2
+        self.assertEqual(next(i), 2)
+        i.pop_marker(True) #1
+        self.assertEqual(next(i), 0)
+
+    def test_default_at_end(self):
+        i = LookAheadListIterator([0])
+
+        self.assertEqual(next(i), 0)
+        with self.assertRaises(StopIteration):
+            next(i)
+
+        i.set_default(-1)
+        self.assertEqual(next(i), -1)
+        self.assertEqual(next(i), -1)
+        self.assertEqual(i.look(), -1)
+
+
 if __name__=="__main__":
     unittest.main()
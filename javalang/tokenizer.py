@@ -1,9 +1,8 @@
 import re
+import sys
 import unicodedata
 from collections import namedtuple
 
-import six
-
 
 class LexerError(Exception):
     pass
@@ -121,15 +120,15 @@ class Operator(JavaToken):
     # lexing. The job of potentially recombining these symbols is left to the
     # parser
 
-    INFIX = set(['||', '&&', '|', '^', '&', '==', '!=', '<', '>', '<=', '>=',
-                 '<<', '>>', '>>>', '+', '-', '*', '/', '%'])
+    INFIX = frozenset(['||', '&&', '|', '^', '&', '==', '!=', '<', '>', '<=',
+                       '>=', '<<', '>>', '>>>', '+', '-', '*', '/', '%'])
 
-    PREFIX = set(['++', '--', '!', '~', '+', '-'])
+    PREFIX = frozenset(['++', '--', '!', '~', '+', '-'])
 
-    POSTFIX = set(['++', '--'])
+    POSTFIX = frozenset(['++', '--'])
 
-    ASSIGNMENT = set(['=', '+=', '-=', '*=', '/=', '&=', '|=', '^=', '%=',
-                      '<<=', '>>=', '>>>='])
+    ASSIGNMENT = frozenset(['=', '+=', '-=', '*=', '/=', '&=', '|=', '^=',
+                            '%=', '<<=', '>>=', '>>>='])
 
     LAMBDA = set(['->'])
 
@@ -161,6 +160,53 @@ class JavaTokenizer(object):
 
     IDENT_PART_CATEGORIES = set(['Lu', 'Ll', 'Lt', 'Lm', 'Lo', 'Mc', 'Mn', 'Nd', 'Nl', 'Pc', 'Sc'])
 
+    # Tokens whose values come from a fixed vocabulary. Their values are
+    # interned so the parser's comparisons against literals and its dispatch
+    # table lookups usually succeed on identity alone.
+    INTERNED_TYPES = frozenset([Keyword, Modifier, BasicType, Boolean, Null,
+                                Separator, Operator])
+
+    # The ASCII characters that can start an identifier
+    ASCII_IDENTIFIER_STARTS = frozenset('abcdefghijklmnopqrstuvwxyz'
+                                        'ABCDEFGHIJKLMNOPQRSTUVWXYZ_$')
+
+    # The ASCII identifier characters. Runs of these are matched in one go;
+    # only non-ASCII characters are looked up in the Unicode database.
+    ASCII_IDENTIFIER_PART = re.compile(r'[A-Za-z0-9_$]*')
+
+    # Every operator, longest first so the longest one at a position wins
+    OPERATOR = re.compile('|'.join(re.escape(operator) for operator in
+                                   sorted(Operator.VALUES, key=len, reverse=True)))
+
+    # A backslash pair, or a unicode escape: a backslash, one or more 'u's
+    # and four hex digits. Pairs match first, so \\u0041 is not an escape.
+    UNICODE_ESCAPE = re.compile(r'\\\\|\\u+([0-9a-fA-F]{4})?')
+
+    # Token class of every reserved word, so read_identifier classifies an
+    # identifier with a single lookup. Basic types and modifiers take
+    # precedence over plain keywords.
+    RESERVED_WORD_TYPES = dict.fromkeys(Keyword.VALUES, Keyword)
+    RESERVED_WORD_TYPES.update(dict.fromkeys(Modifier.VALUES & Keyword.VALUES, Modifier))
+    RESERVED_WORD_TYPES.update(dict.fromkeys(BasicType.VALUES & Keyword.VALUES, BasicType))
+    RESERVED_WORD_TYPES.update(dict.fromkeys(Boolean.VALUES - Keyword.VALUES, Boolean))
+    RESERVED_WORD_TYPES.setdefault('null', Null)
+
+    # Leading white space of each non-blank line in a text block
+    TEXT_BLOCK_INDENT = re.compile(r'^([^\S\n]*)\S', re.MULTILINE)
+
+    # Characters that end a plain run of string or character literal text
+    STRING_SPECIALS = {'"': re.compile(r'["\\]'), "'": re.compile(r"['\\]")}
+
+    # Characters that may follow a backslash in a string or character literal
+    STRING_ESCAPES = frozenset('btnfru"\'\\01234567')
+
+    # Escape sequences in a text block, including line continuations. Octal
+    # escapes take up to three digits when the first is 0-3 (JLS 3.10.7).
+    TEXT_BLOCK_ESCAPE = re.compile(r'\\([0-3][0-7]{0,2}|[4-7][0-7]?|[\s\S]?)')
+
+    TEXT_BLOCK_ESCAPES = {'\n': '', 'b': '\b', 't': '\t', 'n': '\n', 'f': '\f',
+                          'r': '\r', 's': ' ', '"': '"', "'": "'", '\\': '\\'}
+
     def __init__(self, data, ignore_errors=False):
         self.data = data
         self.ignore_errors = ignore_errors
@@ -170,11 +216,6 @@ class JavaTokenizer(object):
         self.current_line = 1
         self.start_of_line = -1
 
-        self.operators = [set() for i in range(0, Operator.MAX_LEN)]
-
-        for v in Operator.VALUES:
-            self.operators[len(v) - 1].add(v)
-
         self.whitespace_consumer = re.compile(r'[^\s]')
 
         self.javadoc = None
@@ -185,7 +226,19 @@ class JavaTokenizer(object):
         self.j = 0
 
     def consume_whitespace(self):
-        match = self.whitespace_consumer.search(self.data, self.i + 1)
+        data = self.data
+        i = self.i + 1
+
+        # Most runs are a single space or newline between two tokens
+        if i < self.length and not data[i].isspace():
+            if data[self.i] == '\n':
+                self.start_of_line = self.i
+                self.current_line += 1
+
+            self.i = i
+            return
+
+        match = self.whitespace_consumer.search(data, i)
 
         if not match:
             self.i = self.length
@@ -193,135 +246,67 @@ class JavaTokenizer(object):
 
         i = match.start()
 
-        start_of_line = self.data.rfind('\n', self.i, i)
+        start_of_line = data.rfind('\n', self.i, i)
 
         if start_of_line != -1:
             self.start_of_line = start_of_line
-            self.current_line += self.data.count('\n', self.i, i)
+            self.current_line += data.count('\n', self.i, i)
 
         self.i = i
 
     def read_string(self):
-        delim = self.data[self.i]
+        data = self.data
+        delim = data[self.i]
+        length = self.length
 
-        state = 0
+        find_special = self.STRING_SPECIALS[delim].search
         j = self.i + 1
-        length = self.length
 
         while True:
-            if j >= length:
+            # Jump straight to the closing delimiter or the next escape
+            match = find_special(data, j)
+
+            if match is None:
                 self.error('Unterminated character/string literal')
+                j = length
                 break
 
-            if state == 0:
-                if self.data[j] == '\\':
-                    state = 1
-                elif self.data[j] == delim:
-                    break
-
-            elif state == 1:
-                if self.data[j] in 'btnfru"\'\\':
-                    state = 0
-                elif self.data[j] in '0123':
-                    state = 2
-                elif self.data[j] in '01234567':
-                    state = 3
-                else:
-                    self.error('Illegal escape character', self.data[j])
+            j = match.start()
 
-            elif state == 2:
-                # Possibly long octal
-                if self.data[j] in '01234567':
-                    state = 3
-                elif self.data[j] == '\\':
-                    state = 1
-                elif self.data[j] == delim:
-                    break
+            if data[j] == delim:
+                break
 
-            elif state == 3:
-                state = 0
+            # Check the character after the backslash. An octal escape needs
+            # no further state: its remaining digits are ordinary characters.
+            j += 1
 
-                if self.data[j] == '\\':
-                    state = 1
-                elif self.data[j] == delim:
-                    break
+            while j < length and data[j] not in self.STRING_ESCAPES:
+                self.error('Illegal escape character', data[j])
+                j += 1
 
             j += 1
 
         self.j = j + 1
 
-    def _process_escape(self, char_iter):
+    def _process_escape(self, match):
         """
-        Processes an escape sequence.
-        Assumes the initial '\' has already been consumed.
-        `char_iter` is an iterator over the characters of the string.
+        Processes an escape sequence matched by TEXT_BLOCK_ESCAPE.
         Returns the processed character(s) for the escape sequence.
         """
-        try:
-            escape_char = next(char_iter)
-        except StopIteration:
+        sequence = match.group(1)
+        replacement = self.TEXT_BLOCK_ESCAPES.get(sequence)
+
+        if replacement is not None:
+            return replacement
+        elif not sequence:
             self.error("Unterminated escape sequence")
             return '\\' # Return backslash as is
-
-        if escape_char == 'b':
-            return '\b'
-        elif escape_char == 't':
-            return '\t'
-        elif escape_char == 'n':
-            return '\n'
-        elif escape_char == 'f':
-            return '\f'
-        elif escape_char == 'r':
-            return '\r'
-        elif escape_char == 's': # Java 15 text block escape for space
-            return ' '
-        elif escape_char == '"':
-            return '"'
-        elif escape_char == "'":
-            return "'"
-        elif escape_char == '\\':
-            return '\\'
-        elif escape_char in '01234567': # Octal escape
-            # Potentially up to 3 octal digits. First digit must be 0-3 if 3 digits.
-            # For simplicity, javalang's existing read_string handles this with states,
-            # but here we'll do a basic version.
-            # This part might need more robust handling matching read_string's states.
-            octal_sequence = escape_char
-            # Try to read up to two more octal digits
-            for _ in range(2):
-                try:
-                    # Peek next char
-                    next_c = char_iter.__next__() if hasattr(char_iter, '__next__') else char_iter.next()
-                    if next_c in '01234567':
-                        octal_sequence += next_c
-                        if len(octal_sequence) == 3 and int(octal_sequence[0]) > 3: # e.g. \400 is invalid
-                            # remove last char and break
-                            octal_sequence = octal_sequence[:-1]
-                            # Need to "put back" next_c, which is hard with an iterator.
-                            # This indicates a need for more sophisticated lookahead or state machine
-                            # For now, this will be a limitation.
-                            break
-                    else:
-                        # This character is not part of octal, needs to be "put back".
-                        # This is a common issue with simple iterators.
-                        # A more robust lexer might use index-based scanning here.
-                        # For now, we consume it and it might be lost or cause issues.
-                        # Consider this a known limitation for complex octal/unicode in text blocks.
-                        break # Or error, or somehow "unread" next_c
-                except StopIteration:
-                    break
-            try:
-                return chr(int(octal_sequence, 8))
-            except ValueError:
-                self.error("Invalid octal escape sequence", "\\" + octal_sequence)
-                return "\\" + octal_sequence
+        elif sequence[0] in '01234567': # Octal escape
+            return chr(int(sequence, 8))
         # Ignoring unicode ('u') escapes here as pre_tokenize handles them.
-        # If pre_tokenize is not run or not sufficient, 'u' would be handled here.
-        # Line continuation '\<newline>' is handled before _process_escape in read_text_block.
         else:
-            self.error('Illegal escape character', escape_char)
-            return '\\' + escape_char
-
+            self.error('Illegal escape character', sequence)
+            return '\\' + sequence
 
     def read_text_block(self):
         # Consume opening """
@@ -380,87 +365,51 @@ class JavaTokenizer(object):
         # 1. Line Terminator Normalization (CRLF, CR -> LF)
         normalized_content = raw_content_block.replace('\r\n', '\n').replace('\r', '\n')
 
-        lines = normalized_content.split('\n')
-
         # 2. Incidental White Space Removal
         # As per JEP 378 / JLS 3.10.6
 
-        # Detect common indent (only from non-blank lines)
-        min_indent = float('inf')
-        content_lines_for_indent_detection = []
-
-        for line_idx, line in enumerate(lines):
-            if line_idx == 0 and not lines: # empty text block """"""
-                 break
-            # The last line is special: if the text block ends with """, the last line
-            # in `lines` corresponds to the line of the closing """. Its indent matters.
-            # JLS: "the G determination is made by examining all the lines of the text block’s content,
-            #       including the line that contains the closing delimiter"
-            # However, if the last line *is* the closing delimiter line and it's blank *before* the delimiter,
-            # it might be considered blank. This part is subtle.
-            # For simplicity here: consider all lines as per split.
-
-            stripped_line = line.lstrip()
-            if not stripped_line: # Blank line
-                # Blank lines do not contribute to min_indent calculation, but are kept
-                content_lines_for_indent_detection.append("") # Placeholder for structure
-            else:
-                indent = len(line) - len(stripped_line)
-                min_indent = min(min_indent, indent)
-                content_lines_for_indent_detection.append(line)
-
-        processed_lines = []
-        if min_indent == float('inf'): # All lines were blank or empty
-            min_indent = 0
-
-        for line in lines:
-            if not line.strip(): # Preserve blank lines as empty strings after normalization
-                                 # or as spaces if they only had spaces and min_indent was 0
-                processed_lines.append("") # Or line if it had spaces and min_indent > 0
-            else:
-                # Remove common indent
-                processed_line = line[min_indent:]
-                # Remove all trailing white space (JLS 3.10.6 Step 2 Part 3)
-                processed_lines.append(processed_line.rstrip())
+        # Detect common indent (only from non-blank lines). All lines count,
+        # including the one holding the closing delimiter; blank lines are
+        # kept but do not contribute to the indent.
+        min_indent = min([len(match.group(1)) for match in
+                          self.TEXT_BLOCK_INDENT.finditer(normalized_content)],
+                         default=0)
+
+        lines = normalized_content.split('\n')
+
+        # Remove common indent and all trailing white space (JLS 3.10.6 Step 2
+        # Part 3); blank lines end up empty.
+        processed_lines = [line[min_indent:].rstrip() for line in lines]
 
         # Rejoin lines, then process escapes
         content_for_escape_processing = "\n".join(processed_lines)
 
         # 3. Escape Sequence Processing
-        # This needs to handle \<line-terminator> (line continuer) first
-        # then other escapes like \n, \t, \s, \\, \", octal, unicode
-
-        # Handle line continuations: \<newline>
-        # This should effectively remove the backslash and the newline
-        content_after_line_continuers = re.sub(r'\\\n', '', content_for_escape_processing)
-
-        # Process other escapes
-        # This is similar to read_string's escape processing logic
-        # but on the already indent-stripped and line-continued string.
-        # For simplicity, we'll build a new string.
-
-        final_chars = []
-        char_iter = iter(content_after_line_continuers)
-        for char_val in char_iter:
-            if char_val == '\\':
-                # _process_escape needs to be adapted or made more robust
-                # for handling iterator state, especially for multi-char escapes.
-                # For now, let's assume _process_escape is sufficient.
-                final_chars.append(self._process_escape(char_iter))
-            else:
-                final_chars.append(char_val)
+        # A single left-to-right pass handles \<line-terminator> (line
+        # continuer) along with the other escapes like \n, \t, \s, \\, \",
+        # octal; unicode escapes were already replaced by pre_tokenize.
+
+        if '\\' in content_for_escape_processing:
+            content_for_escape_processing = self.TEXT_BLOCK_ESCAPE.sub(
+                self._process_escape, content_for_escape_processing)
 
         self.i = self.j # self.i should be after the closing """ for the next token
-        return "".join(final_chars)
+        return content_for_escape_processing
 
     def try_operator(self):
-        for l in range(min(self.length - self.i, Operator.MAX_LEN), 0, -1):
-            if self.data[self.i:self.i + l] in self.operators[l - 1]:
-                self.j = self.i + l
-                return True
+        match = self.OPERATOR.match(self.data, self.i)
+
+        if match:
+            self.j = match.end()
+            return True
+
         return False
 
     def read_comment(self):
+        # Only javadoc comments are returned; the text of any other comment
+        # is skipped over without being copied out
+        is_javadoc = self.data.startswith('/**', self.i)
+
         if self.data[self.i + 1] == '/':
             terminator, accept_eof = '\n', True
         else:
@@ -474,11 +423,11 @@ class JavaTokenizer(object):
             i = self.length
         else:
             self.error('Unterminated block comment')
-            partial_comment = self.data[self.i:]
+            partial_comment = self.data[self.i:] if is_javadoc else None
             self.i = self.length
             return partial_comment
 
-        comment = self.data[self.i:i]
+        comment = self.data[self.i:i] if is_javadoc else None
         start_of_line = self.data.rfind('\n', self.i, i)
 
         if start_of_line != -1:
@@ -490,80 +439,90 @@ class JavaTokenizer(object):
         return comment
 
     def read_decimal_float_or_integer(self):
+        data = self.data
+        length = self.length
         orig_i = self.i
         self.j = self.i
 
         self.read_decimal_integer()
 
-        if self.j >= len(self.data) or self.data[self.j] not in '.eEfFdD':
+        if self.j >= length or data[self.j] not in '.eEfFdD':
             return DecimalInteger
 
-        if self.data[self.j] == '.':
+        if data[self.j] == '.':
             self.i = self.j + 1
             self.read_decimal_integer()
 
-        if self.j < len(self.data) and self.data[self.j] in 'eE':
+        if self.j < length and data[self.j] in 'eE':
             self.j = self.j + 1
 
-            if self.j < len(self.data) and self.data[self.j] in '-+':
+            if self.j < length and data[self.j] in '-+':
                 self.j = self.j + 1
 
             self.i = self.j
             self.read_decimal_integer()
 
-        if self.j < len(self.data) and self.data[self.j] in 'fFdD':
+        if self.j < length and data[self.j] in 'fFdD':
             self.j = self.j + 1
 
         self.i = orig_i
         return DecimalFloatingPoint
 
     def read_hex_integer_or_float(self):
+        data = self.data
+        length = self.length
         orig_i = self.i
         self.j = self.i + 2
 
         self.read_hex_integer()
 
-        if self.j >= len(self.data) or self.data[self.j] not in '.pP':
+        if self.j >= length or data[self.j] not in '.pP':
             return HexInteger
 
-        if self.data[self.j] == '.':
+        if data[self.j] == '.':
             self.j = self.j + 1
             self.read_digits('0123456789abcdefABCDEF')
 
-        if self.j < len(self.data) and self.data[self.j] in 'pP':
+        if self.j < length and data[self.j] in 'pP':
             self.j = self.j + 1
         else:
             self.error('Invalid hex float literal')
 
-        if self.j < len(self.data) and self.data[self.j] in '-+':
+        if self.j < length and data[self.j] in '-+':
             self.j = self.j + 1
 
         self.i = self.j
         self.read_decimal_integer()
 
-        if self.j < len(self.data) and self.data[self.j] in 'fFdD':
+        if self.j < length and data[self.j] in 'fFdD':
             self.j = self.j + 1
 
         self.i = orig_i
         return HexFloatingPoint
 
     def read_digits(self, digits):
-        tmp_i = 0
-        c = None
+        data = self.data
+        length = self.length
 
-        while self.j + tmp_i < len(self.data):
-            c = self.data[self.j + tmp_i]
+        # j ends after the last digit, k runs ahead over underscores that
+        # may turn out to be trailing
+        j = k = self.j
+
+        while k < length:
+            c = data[k]
 
             if c in digits:
-                self.j += 1 + tmp_i
-                tmp_i = 0
+                k += 1
+                j = k
             elif c == '_':
-                tmp_i += 1
+                k += 1
             else:
                 break
 
-        if c in 'lL':
-            self.j += 1
+        if j < length and data[j] in 'lL':
+            j += 1
+
+        self.j = j
 
     def read_decimal_integer(self):
         self.j = self.i
@@ -582,12 +541,15 @@ class JavaTokenizer(object):
         self.read_digits('01234567')
 
     def read_integer_or_float(self, c, c_next):
-        if c == '0' and c_next in 'xX':
+        # c_next is None when the number is the last character of the input
+        if c != '0' or c_next is None:
+            return self.read_decimal_float_or_integer()
+        elif c_next in 'xX':
             return self.read_hex_integer_or_float()
-        elif c == '0' and c_next in 'bB':
+        elif c_next in 'bB':
             self.read_bin_integer()
             return BinaryInteger
-        elif c == '0' and c_next in '01234567':
+        elif c_next in '01234567':
             self.read_octal_integer()
             return OctalInteger
         else:
@@ -604,7 +566,7 @@ class JavaTokenizer(object):
         codecs = ['utf_8', 'iso-8859-1']
 
         # If data is already unicode don't try to redecode
-        if isinstance(self.data, six.text_type):
+        if isinstance(self.data, str):
             return self.data
 
         for codec in codecs:
@@ -620,85 +582,38 @@ class JavaTokenizer(object):
         return unicodedata.category(c) in self.IDENT_START_CATEGORIES
 
     def read_identifier(self):
-        self.j = self.i + 1
+        data = self.data
+        match_ascii = self.ASCII_IDENTIFIER_PART.match
+        j = match_ascii(data, self.i + 1).end()
 
-        while self.j < len(self.data) and unicodedata.category(self.data[self.j]) in self.IDENT_PART_CATEGORIES:
-            self.j += 1
+        while (j < self.length and data[j] > '\x7f' and
+               unicodedata.category(data[j]) in self.IDENT_PART_CATEGORIES):
+            j = match_ascii(data, j + 1).end()
 
-        ident = self.data[self.i:self.j]
-        if ident in Keyword.VALUES:
-            token_type = Keyword
+        self.j = j
 
-            if ident in BasicType.VALUES:
-                token_type = BasicType
-            elif ident in Modifier.VALUES:
-                token_type = Modifier
+        return self.RESERVED_WORD_TYPES.get(self.data[self.i:self.j], Identifier)
 
-        elif ident in Boolean.VALUES:
-            token_type = Boolean
-        elif ident == 'null':
-            token_type = Null
-        else:
-            token_type = Identifier
+    def _process_unicode_escape(self, match):
+        digits = match.group(1)
+
+        if digits is not None:
+            return chr(int(digits, 16))
+        elif match.group() != '\\\\':
+            end = match.end()
+            self.error('Invalid unicode escape', match.string[end:end + 4])
 
-        return token_type
+        # An escaped backslash, which cannot start a unicode escape, or an
+        # invalid escape left as it is
+        return match.group()
 
     def pre_tokenize(self):
-        new_data = list()
         data = self.decode_data()
 
-        i = 0
-        j = 0
-        length = len(data)
-
-        NONE         = 0
-        ELIGIBLE     = 1
-        MARKER_FOUND = 2
-
-        state = NONE
-
-        while j < length:
-            if state == NONE:
-                j = data.find('\\', j)
-
-                if j == -1:
-                    j = length
-                    break
+        if '\\u' in data:
+            data = self.UNICODE_ESCAPE.sub(self._process_unicode_escape, data)
 
-                state = ELIGIBLE
-
-            elif state == ELIGIBLE:
-                c = data[j]
-
-                if c == 'u':
-                    state = MARKER_FOUND
-                    new_data.append(data[i:j - 1])
-                else:
-                    state = NONE
-
-            elif state == MARKER_FOUND:
-                c = data[j]
-
-                if c != 'u':
-                    try:
-                        escape_code = int(data[j:j+4], 16)
-                    except ValueError:
-                        self.error('Invalid unicode escape', data[j:j+4])
-
-                    new_data.append(six.unichr(escape_code))
-
-                    i = j + 4
-                    j = i
-
-                    state = NONE
-
-                    continue
-
-            j = j + 1
-
-        new_data.append(data[i:])
-
-        self.data = ''.join(new_data)
+        self.data = data
         self.length = len(self.data)
 
     def tokenize(self):
@@ -712,23 +627,26 @@ class JavaTokenizer(object):
 
             c = self.data[self.i]
             c_next = None
-            startswith = c
 
             if self.i + 1 < self.length:
                 c_next = self.data[self.i + 1]
-                startswith = c + c_next
 
             if c.isspace():
                 self.consume_whitespace()
                 continue
 
-            elif startswith in ("//", "/*"):
+            elif c in self.ASCII_IDENTIFIER_STARTS:
+                # Checked ahead of the other branches, none of which an
+                # identifier start could satisfy
+                token_type = self.read_identifier()
+
+            elif c == '/' and (c_next == '/' or c_next == '*'):
                 comment = self.read_comment()
-                if comment.startswith("/**"):
+                if comment is not None:
                     self.javadoc = comment
                 continue
 
-            elif startswith == '..' and self.try_operator():
+            elif c == '.' and c_next == '.' and self.try_operator():
                 # Ensure we don't mistake a '...' operator as a sequence of
                 # three '.' separators. This is done as an optimization instead
                 # of moving try_operator higher in the chain because operators
@@ -788,7 +706,10 @@ class JavaTokenizer(object):
                 continue
 
             position = Position(self.current_line, self.i - self.start_of_line)
-            token = token_type(self.data[self.i:self.j], position, self.javadoc)
+            value = self.data[self.i:self.j]
+            if token_type in self.INTERNED_TYPES:
+                value = sys.intern(value)
+            token = token_type(value, position, self.javadoc)
             yield token
 
             if self.javadoc:
@@ -824,53 +745,57 @@ def reformat_tokens(tokens):
     ident_last = False
 
     output = list()
+    append = output.append
+
+    # Line break followed by the current indentation
+    newline = '\n'
 
     for token in tokens:
+        value = token.value
+        ident_like = isinstance(token, (Literal, Keyword, Identifier))
+
         if closed_block:
             closed_block = False
             indent -= 4
+            newline = '\n' + ' ' * indent
 
-            output.append('\n')
-            output.append(' ' * indent)
-            output.append('}')
+            append(newline + '}')
 
-            if isinstance(token, (Literal, Keyword, Identifier)):
-                output.append('\n')
-                output.append(' ' * indent)
+            if ident_like:
+                append(newline)
 
-        if token.value == '{':
+        if value == '{':
             indent += 4
-            output.append(' {\n')
-            output.append(' ' * indent)
+            newline = '\n' + ' ' * indent
+            append(' {' + newline)
 
-        elif token.value == '}':
+        elif value == '}':
             closed_block = True
 
-        elif token.value == ',':
-            output.append(', ')
+        elif value == ',':
+            append(', ')
 
-        elif isinstance(token, (Literal, Keyword, Identifier)):
+        elif ident_like:
             if ident_last:
                 # If the last token was a literla/keyword/identifer put a space in between
-                output.append(' ')
+                append(' ')
             ident_last = True
-            output.append(token.value)
+            append(value)
 
         elif isinstance(token, Operator):
-            output.append(' ' + token.value + ' ')
+            append(' ' + value + ' ')
 
-        elif token.value == ';':
-            output.append(';\n')
-            output.append(' ' * indent)
+        elif value == ';':
+            append(';' + newline)
 
         else:
-            output.append(token.value)
+            append(value)
 
-        ident_last = isinstance(token, (Literal, Keyword, Identifier))
+        ident_last = ident_like
 
     if closed_block:
-        output.append('\n}')
+        append('\n}')
 
-    output.append('\n')
+    append('\n')
 
     return ''.join(output)
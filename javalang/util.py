@@ -107,11 +107,21 @@ class LookAheadListIterator(object):
         return self.__next__()
 
     def __next__(self):
+        """ Return the next value and advance past it.
+
+        Past the end of the list the default is returned, if one was set with
+        set_default(), without advancing; otherwise StopIteration is raised.
+
+        """
+
         try:
             self.value = self.list[self.marker]
             self.marker += 1
         except IndexError:
-            raise StopIteration()
+            if self.default is None:
+                raise StopIteration()
+
+            self.value = self.default
 
         return self.value
 
@@ -158,8 +168,8 @@ class LookAheadListIterator(object):
 
         saved = self.saved_markers.pop()
 
+        # Accepting leaves any enclosing marker where it was, so resetting
+        # that one later still returns to its own starting point
         if reset:
             self.marker = saved
-        elif self.saved_markers:
-            self.saved_markers[-1] = saved
 